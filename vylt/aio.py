@@ -0,0 +1,62 @@
+"""
+asyncio wrappers around vylt.api.
+
+Each call runs the blocking API function in an executor (the loop's
+default thread pool unless `executor` is given). ciph releases the GIL
+inside its C calls, so one process can run many archive jobs at once:
+
+    results = await asyncio.gather(
+        aio.encrypt_tree("a", "out/", pwd),
+        aio.encrypt_tree("b", "out/", pwd),
+    )
+"""
+
+import asyncio
+import functools
+
+from . import api
+
+
+async def _run(executor, fn, *args, **kwargs):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(
+        executor, functools.partial(fn, *args, **kwargs)
+    )
+
+
+async def encrypt_tree(path, out, password, *, executor=None, **kwargs):
+    return await _run(executor, api.encrypt_tree, path, out, password, **kwargs)
+
+
+async def encrypt_batch(jobs, password, *, executor=None, **kwargs):
+    return await _run(executor, api.encrypt_batch, jobs, password, **kwargs)
+
+
+async def decrypt_archive(src, password, outdir, *, executor=None, **kwargs):
+    return await _run(
+        executor, api.decrypt_archive, src, password, outdir, **kwargs
+    )
+
+
+async def open_archive(src, *, executor=None):
+    return await _run(executor, api.open_archive, src)
+
+
+async def iter_manifest(src, password=None, *, executor=None):
+    return await _run(executor, api.iter_manifest, src, password)
+
+
+async def verify_archive(src, password=None, *, executor=None, **kwargs):
+    return await _run(executor, api.verify_archive, src, password, **kwargs)
+
+
+async def repair_archive(src, *, executor=None):
+    return await _run(executor, api.repair_archive, src)
+
+
+async def encrypt_stream(src, dst, password, *, executor=None, **kwargs):
+    return await _run(executor, api.encrypt_stream, src, dst, password, **kwargs)
+
+
+async def decrypt_stream(src, dst, password, *, executor=None):
+    return await _run(executor, api.decrypt_stream, src, dst, password)
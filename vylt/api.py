@@ -0,0 +1,383 @@
+"""
+Vylt library API.
+
+Everything the `vylt` CLI does, without prompts, prints, progress bars
+or SystemExit. Sources and destinations may be paths, binary file
+objects or raw file descriptors (descriptors are never closed).
+
+Errors are raised as ValueError (bad arguments or archive format),
+RuntimeError (ciph failures, e.g. a wrong password) or OSError.
+
+    from vylt import api
+
+    res = api.encrypt_tree("photos", "backups/", b"secret")
+    part = res.parts[0].path
+
+    info = api.open_archive(part)
+    for name in api.iter_manifest(part):
+        print(name)
+
+    api.decrypt_archive(part, b"secret", "restored/")
+
+encrypt_stream/decrypt_stream handle unbounded pipes in constant memory.
+See vylt.aio for asyncio wrappers.
+"""
+
+import os
+from contextlib import contextmanager, nullcontext
+from typing import List, NamedTuple, Optional
+
+from .header import read_outer, parse_manifest
+
+# The encrypt/decrypt machinery (tarfile, process pools, tqdm, libciph)
+# is imported inside the functions that need it, so open_archive and
+# iter_manifest stay cheap to import and call.
+
+
+# -------------------------
+# Results
+# -------------------------
+
+class ArchiveInfo(NamedTuple):
+    magic: bytes
+    version: int
+    sealed: int
+    aid: bytes
+    part: int
+    total: int
+    meta_len: int
+    meta_hash: bytes
+    data_hash: bytes        # v2: Merkle root of the block table
+    block_size: int = 0     # v1 parts have no block table
+    block_count: int = 0
+    data_len: int = 0
+
+
+class PartResult(NamedTuple):
+    path: Optional[str]     # None when written to a file object / fd
+    part: int
+    total: int
+    files: int
+    size: int               # plaintext tar bytes
+    bytes: int              # container bytes written
+    seconds: float
+
+
+class EncryptResult(NamedTuple):
+    aid: bytes
+    parts: List[PartResult]
+
+
+class BatchResult(NamedTuple):
+    jobs: List[EncryptResult]   # in input order
+    workers: int
+    files: int
+    bytes: int                  # source bytes
+    seconds: float
+
+
+class RestoreResult(NamedTuple):
+    aid: bytes
+    part: int
+    total: int
+    entries: int
+    size: int               # encrypted payload bytes
+    seconds: float
+    skipped: int = 0        # unsafe or unsupported members
+
+
+class DecryptResult(NamedTuple):
+    outdir: str
+    parts: List[RestoreResult]
+
+
+class VerifyResult(NamedTuple):
+    path: str
+    version: int
+    blocks: int
+    checked: int            # blocks hashed (fewer with `only`)
+    bad: List[tuple]        # damaged (start, end) byte ranges
+    files: Optional[List[str]]  # paths stored there; None if sealed
+    ok: bool
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def _pwd(p):
+    return p.encode() if isinstance(p, str) else bytes(p)
+
+
+def _is_path(obj):
+    return isinstance(obj, (str, os.PathLike))
+
+
+@contextmanager
+def _stream(obj, mode):
+    if isinstance(obj, int):
+        with os.fdopen(obj, mode, closefd=False) as f:
+            yield f
+    elif _is_path(obj):
+        with open(obj, mode) as f:
+            yield f
+    else:
+        yield obj
+
+
+def _read_header(f):
+    return ArchiveInfo._make(read_outer(f)[:-1])
+
+
+def _unseal(blob, password):
+    from .ciphwrap import decrypt_bytes
+
+    return decrypt_bytes(blob, password)
+
+
+def _part_result(r):
+    return PartResult(
+        r["path"], r["part"], r["total"], r["files"], r["size"],
+        r["bytes"], r["pack_seconds"] + r["encrypt_seconds"],
+    )
+
+
+def _restore_result(r):
+    return RestoreResult(
+        r["aid"], r["part"], r["total"], r["entries"], r["size"],
+        r["decrypt_seconds"] + r["extract_seconds"], r["skipped"],
+    )
+
+
+def _fd(obj):
+    if isinstance(obj, int):
+        return obj
+    if hasattr(obj, "flush"):
+        obj.flush()
+    return obj.fileno()
+
+
+def _encrypt_task(args):
+    from .parallel import encrypt_part
+
+    return encrypt_part(*args)
+
+
+# -------------------------
+# Public API
+# -------------------------
+
+def open_archive(src):
+    """
+    Read the outer header of one archive part.
+    `src` is a path, binary file object or fd.
+    """
+    with _stream(src, "rb") as f:
+        return _read_header(f)
+
+
+def iter_manifest(src, password=None):
+    """
+    Iterate over the paths stored in one archive part.
+    `password` is required only when the metadata is sealed.
+    """
+    with _stream(src, "rb") as f:
+        info = _read_header(f)
+        blob = f.read(info.meta_len)
+
+    if len(blob) != info.meta_len:
+        raise ValueError("Truncated Vylt archive")
+
+    if info.sealed:
+        if password is None:
+            raise ValueError("Metadata is sealed; password required")
+        blob = _unseal(blob, _pwd(password))
+
+    return iter(parse_manifest(blob))
+
+
+def encrypt_tree(
+    path,
+    out,
+    password,
+    *,
+    meta_password=None,
+    seal=False,
+    threads=1,
+    aid=None,
+    parity=0,
+):
+    """
+    Encrypt a file or directory tree.
+
+    `out` is a directory (parts get the usual `<name>.<aid>[.NNN].vylt`
+    names) or, for a single-part archive, a target path, binary file
+    object or fd. Archive names are relative to the parent of `path`.
+    `meta_password` defaults to `password`. `threads` is a worker count
+    or "auto" and picks shards and workers as `vylt encrypt` does.
+    `parity` > 0 writes that many `.vpar` parity files next to the parts
+    (directory output only).
+    """
+    from concurrent.futures import ProcessPoolExecutor
+    from . import throttle
+    from .parallel import _collect_files, _shape, encrypt_part, plan_shards
+    from .sched import Governor, run_gated
+
+    path = os.path.abspath(os.fspath(path).rstrip("/"))
+    files = _collect_files(path)
+    if not files:
+        raise ValueError("Nothing to encrypt")
+
+    aid = os.urandom(8) if aid is None else aid
+    if len(aid) != 8:
+        raise ValueError("Archive ID must be 8 bytes")
+
+    data_pwd = _pwd(password)
+    meta_pwd = data_pwd if meta_password is None else _pwd(meta_password)
+    seal = 1 if seal else 0
+    start = os.path.dirname(path)
+
+    auto = threads == "auto"
+    to_dir = _is_path(out) and os.path.isdir(out)
+    if to_dir:
+        size = sum(os.lstat(f).st_size for f in files)
+        n, workers, _ = _shape(size, len(files), "auto" if auto else max(1, int(threads)))
+    elif auto or int(threads) <= 1:
+        n = workers = 1
+    else:
+        raise ValueError("Multi-part output needs a directory")
+    if parity and not to_dir:
+        raise ValueError("Parity output needs a directory")
+
+    if to_dir:
+        shards = plan_shards(path, files, n, aid, os.fspath(out))
+    else:
+        shards = [(files, out, 1, 1)]
+    tasks = [
+        (b, t, data_pwd, meta_pwd, aid, i, total, seal, start)
+        for b, t, i, total in shards
+    ]
+
+    if len(tasks) == 1:
+        b, target, *rest = tasks[0]
+        # Paths are opened by encrypt_part itself so the result names them.
+        wrap = _stream(target, "wb") if isinstance(target, int) else nullcontext(target)
+        with wrap as t:
+            r = encrypt_part(b, t, *rest)
+        parts = [_part_result(r)]
+    else:
+        throttle.share(workers)
+        try:
+            with ProcessPoolExecutor(workers) as ex:
+                if auto:
+                    with Governor(workers) as gov:
+                        done = run_gated(ex, _encrypt_task, tasks, gov)
+                else:
+                    done = list(ex.map(_encrypt_task, tasks))
+        finally:
+            throttle.share(1)
+        parts = sorted((_part_result(r) for r in done), key=lambda p: p.part)
+
+    if parity:
+        from .parity import write_parity
+
+        write_parity([p.path for p in parts], len(parts), aid, parity)
+    return EncryptResult(aid, parts)
+
+
+def encrypt_batch(jobs, password, *, meta_password=None, threads="auto"):
+    """
+    Encrypt many roots with one shared process pool. Each job is a path
+    or a dict with "path" and optional "out", "seal", "parity" and
+    "shards" (see vylt.batch). Shards from all jobs are scheduled
+    largest first; `threads` is a worker count or "auto".
+    """
+    from .batch import run_batch
+
+    jobs = [j if isinstance(j, dict) else {"path": j} for j in jobs]
+    data_pwd = _pwd(password)
+    meta_pwd = data_pwd if meta_password is None else _pwd(meta_password)
+
+    r = run_batch(jobs, data_pwd, meta_pwd, threads)
+    return BatchResult(
+        [
+            EncryptResult(j["aid"], [_part_result(p) for p in j["parts"]])
+            for j in r["jobs"]
+        ],
+        r["workers"], r["files"], r["bytes"], r["seconds"],
+    )
+
+
+def decrypt_archive(src, password, outdir, *, writers=None):
+    """
+    Decrypt an archive into `outdir`.
+
+    A path restores every part of its archive; a file object or fd
+    restores that single part. `writers` defaults to restore.WRITERS.
+    """
+    from .restore import WRITERS, find_parts, restore_part
+
+    writers = WRITERS if writers is None else writers
+    pwd = _pwd(password)
+    outdir = os.path.abspath(outdir)
+
+    if _is_path(src):
+        parts = [
+            _restore_result(restore_part(p, pwd, outdir, writers))
+            for p in find_parts(os.fspath(src))
+        ]
+    else:
+        with _stream(src, "rb") as f:
+            parts = [_restore_result(restore_part(f, pwd, outdir, writers))]
+
+    return DecryptResult(outdir, parts)
+
+
+def verify_archive(src, password=None, *, only=None, workers=None):
+    """
+    Check every part of the archive at path `src` without decrypting
+    it. `only` (fnmatch patterns) limits v2 parts to the blocks needed
+    to restore the matching files. `password` is only used to name
+    damaged files when the metadata is sealed.
+    """
+    from .integrity import verify_part
+    from .restore import find_parts
+
+    pwd = None if password is None else _pwd(password)
+    return [
+        VerifyResult(**verify_part(p, pwd, only, workers))
+        for p in find_parts(os.fspath(src))
+    ]
+
+
+def repair_archive(src):
+    """
+    Rebuild missing or damaged parts of the archive at path `src` from
+    its parity files; no password needed. Returns (repaired, intact)
+    lists of part paths.
+    """
+    from .parity import repair
+
+    return repair(os.fspath(src))
+
+
+def encrypt_stream(src, dst, password, *, aid=None):
+    """
+    Encrypt an unbounded stream into a stream container, in constant
+    memory. `src` and `dst` are fds or objects with fileno() (pipes,
+    sockets, files). Returns (aid, length, data_hash).
+    """
+    from .stream import encrypt_stream as run
+
+    return run(_fd(src), _fd(dst), _pwd(password), aid)
+
+
+def decrypt_stream(src, dst, password):
+    """
+    Decrypt a stream container. Output is written before the trailer is
+    verified; on any exception the output must be discarded.
+    Returns the archive ID.
+    """
+    from .stream import decrypt_stream as run
+
+    return run(_fd(src), _fd(dst), _pwd(password))
@@ -0,0 +1,198 @@
+import os
+import json
+import time
+import shutil
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from . import throttle
+from .parallel import _collect_files, encrypt_part, plan_shards
+from .sched import SHARDS_PER_WORKER, Governor, pick_workers, run_gated
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+# Jobs are cut into shards of roughly total / (workers × SHARDS_PER_WORKER)
+# bytes, but never smaller than this.
+MIN_SHARD = 64 * 1024 * 1024
+
+
+# -------------------------
+# Jobs
+# -------------------------
+#
+# jobs.json is either a list of jobs or {"threads": ..., "jobs": [...]}.
+# A job is {"path": ...} plus optional "out" (directory, default: beside
+# path), "seal" (bool), "parity" (int) and "shards" (int).
+
+def load_jobs(path):
+    """Returns (jobs, threads) from a jobs file; threads may be None."""
+    with open(path) as f:
+        data = json.load(f)
+
+    threads = None
+    if isinstance(data, dict):
+        threads = data.get("threads")
+        data = data.get("jobs")
+    if not isinstance(data, list) or not data:
+        raise ValueError("jobs file must list at least one job")
+
+    jobs = []
+    for j in data:
+        if isinstance(j, str):
+            j = {"path": j}
+        if not isinstance(j, dict) or "path" not in j:
+            raise ValueError(f"Bad job: {j!r}")
+        jobs.append(j)
+    return jobs, threads
+
+
+def _task(args):
+    k, part = args
+    return k, encrypt_part(*part)
+
+
+def _check_space(need):
+    """`need` maps output directories to bytes; checked per filesystem."""
+    by_dev = {}
+    for d, n in need.items():
+        dev = os.stat(d).st_dev
+        first, total = by_dev.get(dev, (d, 0))
+        by_dev[dev] = (first, total + n)
+    for d, n in by_dev.values():
+        free = shutil.disk_usage(d).free
+        if free < n:
+            raise ValueError(
+                f"Not enough disk space in {d}: "
+                f"{n >> 20} MB needed, {free >> 20} MB free"
+            )
+
+
+def _scan(job):
+    path = os.path.abspath(os.fspath(job["path"]).rstrip("/"))
+    files = _collect_files(path)
+    if not files:
+        raise ValueError(f"Nothing to encrypt: {path}")
+    sizes = {f: os.lstat(f).st_size for f in files}
+    return path, files, sizes
+
+
+# -------------------------
+# Run
+# -------------------------
+
+def run_batch(jobs, data_pwd, meta_pwd, threads="auto", on_start=None,
+              on_done=None):
+    """
+    Encrypt many roots with one process pool.
+
+    Every job is cut into shards sized from the whole batch, and all
+    shards are queued largest first so the long ones start early and
+    small ones fill the tail. With threads="auto" the pool is sized by
+    sched.pick_workers and gated by a Governor.
+
+    `on_start(n_shards)` is called once planning is done and
+    `on_done(job_index, part_stats)` after each shard.
+
+    Returns a dict with per-job results and aggregate statistics.
+    Raises ValueError if an output filesystem cannot hold its jobs.
+    """
+    t0 = time.perf_counter()
+    scanned = [_scan(j) for j in jobs]
+    total = sum(sum(s.values()) for _, _, s in scanned)
+    units = sum(len(f) for _, f, _ in scanned)
+
+    largest = max(sum(s.values()) for _, _, s in scanned)
+
+    def shard_bytes(w):
+        return min(largest, max(MIN_SHARD, total / (w * SHARDS_PER_WORKER)))
+
+    auto = threads == "auto"
+    if auto:
+        workers, why = pick_workers(total, units, shard_bytes=shard_bytes)
+    else:
+        workers, why = max(1, int(threads)), []
+
+    target = max(MIN_SHARD, total // (workers * SHARDS_PER_WORKER))
+
+    results = []
+    queue = []
+    need = {}
+    for k, (job, (path, files, sizes)) in enumerate(zip(jobs, scanned)):
+        weight = sum(sizes.values())
+        n = job.get("shards") or -(-weight // target)
+        n = max(1, min(int(n), len(files)))
+
+        aid = os.urandom(8)
+        dest = job.get("out")
+        if dest is not None:
+            dest = os.path.abspath(dest)
+            os.makedirs(dest, exist_ok=True)
+        d = os.path.dirname(path) if dest is None else dest
+        need[d] = need.get(d, 0) + weight
+
+        results.append({
+            "path": path,
+            "aid": aid,
+            "files": len(files),
+            "bytes": weight,
+            "parts": [],
+            "parity": [],
+        })
+
+        seal = 1 if job.get("seal") else 0
+        start = os.path.dirname(path)
+        for b, out, part, tot in plan_shards(path, files, n, aid, dest, sizes):
+            args = (b, out, data_pwd, meta_pwd, aid, part, tot, seal, start)
+            queue.append((sum(sizes[f] for f in b), (k, args)))
+
+    _check_space(need)
+
+    # Largest first: the tail of the run is made of small shards.
+    queue.sort(key=lambda q: q[0], reverse=True)
+    tasks = [t for _, t in queue]
+    workers = min(workers, len(tasks))
+
+    if on_start:
+        on_start(len(tasks))
+
+    def done(r):
+        k, stats = r
+        results[k]["parts"].append(stats)
+        if on_done:
+            on_done(k, stats)
+
+    events = []
+    throttle.share(workers)
+    with ProcessPoolExecutor(workers) as ex:
+        if auto:
+            with Governor(workers) as gov:
+                run_gated(ex, _task, tasks, gov, done)
+            events = gov.events
+        else:
+            futs = [ex.submit(_task, t) for t in tasks]
+            for fut in as_completed(futs):
+                done(fut.result())
+    throttle.share(1)
+
+    for job, r in zip(jobs, results):
+        r["parts"].sort(key=lambda p: p["part"])
+        if job.get("parity"):
+            from .parity import write_parity
+
+            r["parity"] = write_parity(
+                [p["path"] for p in r["parts"]],
+                len(r["parts"]), r["aid"], int(job["parity"]),
+            )
+
+    return {
+        "jobs": results,
+        "workers": workers,
+        "reasons": why,
+        "events": events,
+        "shards": len(tasks),
+        "files": units,
+        "bytes": total,
+        "seconds": time.perf_counter() - t0,
+    }
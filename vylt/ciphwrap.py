@@ -17,62 +17,87 @@ __version__ = "1.1.2"
 import ctypes
 import os
 
+from . import throttle
+
 
 # -------------------------
-# Load libciph
+# Load libciph (lazily)
 # -------------------------
+#
+# Nothing is loaded at import time: `vylt info` / `list` never touch the
+# native library. The first ciph call loads libciph.so and libc, fixes
+# the ABI types and publishes the handles as module globals; LIB,
+# libc, fdopen and fclose are served (loading first) by __getattr__.
 
-try:
-    LIB = ctypes.CDLL(os.path.join(os.getcwd(), "libciph.so"), mode=ctypes.RTLD_GLOBAL)
-except OSError:
-    LIB = ctypes.CDLL("libciph.so", mode=ctypes.RTLD_GLOBAL)
+_LIB = None
 
+u8_p = ctypes.POINTER(ctypes.c_uint8)
 
-# -------------------------
-# Correct ABI types
-# -------------------------
 
-u8_p = ctypes.POINTER(ctypes.c_uint8)
+def _lib():
+    global _LIB, libc, fdopen, fclose
 
-LIB.ciph_encrypt_stream.argtypes = [
-    ctypes.c_void_p,   # FILE *in
-    ctypes.c_void_p,   # FILE *out
-    u8_p,              # password (RAW)
-    ctypes.c_size_t,   # password_len
-    ctypes.c_int,      # cipher
-    u8_p,              # original_name (RAW)
-]
-LIB.ciph_encrypt_stream.restype = ctypes.c_int
+    if _LIB is not None:
+        return _LIB
 
+    # Only the system search path, or an explicit VYLT_LIBCIPH path: a
+    # libciph.so lying in the working directory is never picked up.
+    name = os.environ.get("VYLT_LIBCIPH") or "libciph.so"
+    lib = ctypes.CDLL(name, mode=ctypes.RTLD_GLOBAL)
 
-LIB.ciph_decrypt_stream.argtypes = [
-    ctypes.c_void_p,   # FILE *in
-    ctypes.c_void_p,   # FILE *out
-    u8_p,              # password (RAW)
-    ctypes.c_size_t,   # password_len
-    ctypes.c_char_p,   # out_name
-    ctypes.c_size_t,   # out_name_len
-]
-LIB.ciph_decrypt_stream.restype = ctypes.c_int
+    # -------------------------
+    # Correct ABI types
+    # -------------------------
 
+    lib.ciph_encrypt_stream.argtypes = [
+        ctypes.c_void_p,   # FILE *in
+        ctypes.c_void_p,   # FILE *out
+        u8_p,              # password (RAW)
+        ctypes.c_size_t,   # password_len
+        ctypes.c_int,      # cipher
+        u8_p,              # original_name (RAW)
+    ]
+    lib.ciph_encrypt_stream.restype = ctypes.c_int
 
-LIB.ciph_strerror.argtypes = [ctypes.c_int]
-LIB.ciph_strerror.restype = ctypes.c_char_p
+    lib.ciph_decrypt_stream.argtypes = [
+        ctypes.c_void_p,   # FILE *in
+        ctypes.c_void_p,   # FILE *out
+        u8_p,              # password (RAW)
+        ctypes.c_size_t,   # password_len
+        ctypes.c_char_p,   # out_name
+        ctypes.c_size_t,   # out_name_len
+    ]
+    lib.ciph_decrypt_stream.restype = ctypes.c_int
 
+    lib.ciph_strerror.argtypes = [ctypes.c_int]
+    lib.ciph_strerror.restype = ctypes.c_char_p
 
-# -------------------------
-# libc helpers
-# -------------------------
+    # -------------------------
+    # libc helpers
+    # -------------------------
+
+    libc = ctypes.CDLL(None)
 
-libc = ctypes.CDLL(None)
+    fdopen = libc.fdopen
+    fdopen.argtypes = [ctypes.c_int, ctypes.c_char_p]
+    fdopen.restype = ctypes.c_void_p
 
-fdopen = libc.fdopen
-fdopen.argtypes = [ctypes.c_int, ctypes.c_char_p]
-fdopen.restype = ctypes.c_void_p
+    fclose = libc.fclose
+    fclose.argtypes = [ctypes.c_void_p]
+    fclose.restype = ctypes.c_int
 
-fclose = libc.fclose
-fclose.argtypes = [ctypes.c_void_p]
-fclose.restype = ctypes.c_int
+    _LIB = lib
+    return _LIB
+
+
+def __getattr__(name):
+    # Old code may reach for the loaded handles directly.
+    if name == "LIB":
+        return _lib()
+    if name in ("libc", "fdopen", "fclose"):
+        _lib()
+        return globals()[name]
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
 
 
 # -------------------------
@@ -80,7 +105,7 @@ fclose.restype = ctypes.c_int
 # -------------------------
 
 def _die(rc: int):
-    msg = LIB.ciph_strerror(rc)
+    msg = _lib().ciph_strerror(rc)
     raise RuntimeError(msg.decode(errors="ignore"))
 
 
@@ -92,58 +117,149 @@ def _as_u8(buf: bytes):
     return (ctypes.c_uint8 * len(buf)).from_buffer_copy(buf)
 
 
-def encrypt_file(src: str, dst: str, password: bytes):
+def encrypt_file(src: str, dst: str, password: bytes, rd=None, wr=None):
+    """
+    Encrypt file `src` into `dst`. `rd` / `wr` are optional
+    throttle.Bucket limits that pace ciph's reads and writes as it runs.
+    """
+    lib = _lib()
     name = os.path.basename(src).encode()
 
     pwd_buf = _as_u8(password)
     name_buf = _as_u8(name)
 
     def _run(cipher: int):
-        infd = os.open(src, os.O_RDONLY)
-        outfd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with throttle.pipes(src, dst, rd, wr) as (infd, outfd):
+            fin = fdopen(infd, b"rb")
+            fout = fdopen(outfd, b"wb")
+
+            rc = lib.ciph_encrypt_stream(
+                fin,
+                fout,
+                pwd_buf,
+                len(password),
+                cipher,
+                name_buf,
+            )
+
+            fclose(fin)
+            fclose(fout)
+        return rc
+
+    rc = _run(1)  # AES
+    if rc == 0:
+        return
 
+    try:
+        os.unlink(dst)
+    except FileNotFoundError:
+        pass
+
+    rc = _run(2)  # ChaCha
+    if rc != 0:
+        _die(rc)
+
+
+def decrypt_file(src: str, dst: str, password: bytes, rd=None, wr=None):
+    """Decrypt file `src` into `dst`; `rd` / `wr` as for encrypt_file."""
+    lib = _lib()
+    pwd_buf = _as_u8(password)
+
+    name_buf = ctypes.create_string_buffer(256)
+
+    with throttle.pipes(src, dst, rd, wr) as (infd, outfd):
         fin = fdopen(infd, b"rb")
         fout = fdopen(outfd, b"wb")
 
-        rc = LIB.ciph_encrypt_stream(
+        rc = lib.ciph_decrypt_stream(
             fin,
             fout,
             pwd_buf,
             len(password),
-            cipher,
             name_buf,
+            ctypes.sizeof(name_buf),
         )
 
         fclose(fin)
         fclose(fout)
-        return rc
 
-    rc = _run(1)  # AES
-    if rc == 0:
-        return
+    if rc != 0:
+        _die(rc)
+
+    return name_buf.value.decode(errors="ignore")
+
+
+def decrypt_bytes(blob: bytes, password: bytes):
+    """
+    Decrypt a small in-memory ciph blob (e.g. sealed metadata).
+    """
+    import tempfile
 
+    fd, enc = tempfile.mkstemp()
+    os.close(fd)
+    fd, dec = tempfile.mkstemp()
+    os.close(fd)
     try:
-        os.unlink(dst)
-    except FileNotFoundError:
-        pass
+        with open(enc, "wb") as f:
+            f.write(blob)
+        decrypt_file(enc, dec, password)
+        with open(dec, "rb") as f:
+            return f.read()
+    finally:
+        for p in (enc, dec):
+            try:
+                os.unlink(p)
+            except FileNotFoundError:
+                pass
+
+
+# -------------------------
+# Descriptor API (pipes / stdio)
+# -------------------------
+
+def encrypt_fd(infd: int, outfd: int, password: bytes, cipher: int = 2, name: bytes = b"-"):
+    """
+    Encrypt from one open descriptor to another. The caller keeps
+    ownership of both fds. No AES→ChaCha retry: a pipe cannot be
+    rewound, so the cipher is fixed up front (ChaCha by default).
+    """
+    lib = _lib()
+    pwd_buf = _as_u8(password)
+    name_buf = _as_u8(name + b"\0")
+
+    fin = fdopen(os.dup(infd), b"rb")
+    fout = fdopen(os.dup(outfd), b"wb")
+
+    rc = lib.ciph_encrypt_stream(
+        fin,
+        fout,
+        pwd_buf,
+        len(password),
+        cipher,
+        name_buf,
+    )
+
+    fclose(fin)
+    fclose(fout)
 
-    rc = _run(2)  # ChaCha
     if rc != 0:
         _die(rc)
 
 
-def decrypt_file(src: str, dst: str, password: bytes):
+def decrypt_fd(infd: int, outfd: int, password: bytes):
+    """
+    Decrypt from one open descriptor to another. The caller keeps
+    ownership of both fds.
+    """
+    lib = _lib()
     pwd_buf = _as_u8(password)
 
-    infd = os.open(src, os.O_RDONLY)
-    outfd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
-
-    fin = fdopen(infd, b"rb")
-    fout = fdopen(outfd, b"wb")
+    fin = fdopen(os.dup(infd), b"rb")
+    fout = fdopen(os.dup(outfd), b"wb")
 
     name_buf = ctypes.create_string_buffer(256)
 
-    rc = LIB.ciph_decrypt_stream(
+    rc = lib.ciph_decrypt_stream(
         fin,
         fout,
         pwd_buf,
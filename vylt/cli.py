@@ -1,26 +1,22 @@
 #!/usr/bin/env python3
 import argparse
 import os
-import glob
 import getpass
-import tempfile
-import struct
-import shutil
-import time
-import threading
 import signal
 import sys
-import tarfile
-from contextlib import contextmanager
-from tqdm import tqdm
 
+# Keep this import list light: `vylt info` / `list` are scripted over
+# thousands of archives. tqdm, tarfile, process pools and libciph are
+# imported inside the commands that use them.
 from .config import VyltConfig
-from .parallel import encrypt_parallel
-from .wipe import wipe_tree
-from .diagnostics import run_diagnostics
-from .header import HEADER_SIZE, unpack_outer
-from .ciphwrap import decrypt_file
-from .fileprogress import track_progress
+from .header import (
+    STREAM_MAGIC,
+    STREAM_SIZE,
+    TRAILER_SIZE,
+    read_outer,
+    unpack_stream,
+    unpack_trailer,
+)
 
 
 class C:
@@ -43,37 +39,15 @@ BANNER = f"""
 """
 
 
-_PENDING = []
+# Temp files belong to restore_part / encrypt_part, which remove them in
+# `finally` blocks: turning the signal into SystemExit is enough.
+def _on_signal(sig, frame):
+    sys.exit(130)
 
 
-def _cleanup(sig=None, frame=None):
-    for p in list(_PENDING):
-        try:
-            if os.path.exists(p):
-                os.unlink(p)
-        except Exception:
-            pass
-    sys.exit(130 if sig else 1)
-
-
-signal.signal(signal.SIGINT, _cleanup)
-signal.signal(signal.SIGTERM, _cleanup)
-
-
-@contextmanager
-def safe_temp(dir=None, suffix=""):
-    fd, path = tempfile.mkstemp(dir=dir, suffix=suffix)
-    os.close(fd)
-    _PENDING.append(path)
-    try:
-        yield path
-    finally:
-        try:
-            if os.path.exists(path):
-                os.unlink(path)
-        finally:
-            if path in _PENDING:
-                _PENDING.remove(path)
+def _install_signals():
+    signal.signal(signal.SIGINT, _on_signal)
+    signal.signal(signal.SIGTERM, _on_signal)
 
 
 def _env_password():
@@ -86,7 +60,7 @@ def _env_password():
 def ask_password(prompt, confirm=False):
     env_pwd = _env_password()
     if env_pwd:
-        print(f"{C.D}• Using password from environment{C.R}")
+        print(f"{C.D}• Using password from environment{C.R}", file=sys.stderr)
         return env_pwd
 
     p = getpass.getpass(prompt).encode()
@@ -98,7 +72,7 @@ def ask_password(prompt, confirm=False):
 def retry_password(prompt):
     env_pwd = _env_password()
     if env_pwd:
-        print(f"{C.D}• Using password from environment{C.R}")
+        print(f"{C.D}• Using password from environment{C.R}", file=sys.stderr)
         return env_pwd
 
     for _ in range(VyltConfig.load().get("max_password_attempts", 5)):
@@ -108,116 +82,311 @@ def retry_password(prompt):
     raise SystemExit(f"{C.E}Too many attempts{C.R}")
 
 
-def find_parts(path):
-    base = os.path.basename(path)
-    parts = base.rsplit(".", 3)
-    if len(parts) < 3:
-        return [path]
-    root, aid = parts[0], parts[1]
-    if not all(c in "0123456789abcdef" for c in aid):
-        return [path]
-    return sorted(glob.glob(f"{root}.{aid}.*.vylt")) or [path]
+def stream_info(path):
+    with open(path, "rb") as f:
+        magic, version, aid = unpack_stream(f.read(STREAM_SIZE))
+        f.seek(-TRAILER_SIZE, os.SEEK_END)
+        length, data_hash = unpack_trailer(f.read(TRAILER_SIZE))
+    print(f"{C.M}Vylt stream info{C.R}")
+    print(f"Magic      : {magic.decode()}")
+    print(f"Version    : {version}")
+    print(f"Archive ID : {aid.hex()}")
+    print(f"Data bytes : {length}")
+    print(f"Data hash  : {data_hash.hex()}")
+
+
+def _is_stream(path):
+    with open(path, "rb") as f:
+        return f.read(len(STREAM_MAGIC)) == STREAM_MAGIC
 
 
 def info_cmd(path):
+    if _is_stream(path):
+        stream_info(path)
+        return
     with open(path, "rb") as f:
-        hdr = f.read(HEADER_SIZE)
-    magic, version, sealed, aid, part, total, meta_len, _, _ = unpack_outer(hdr)
+        try:
+            h = read_outer(f)
+        except ValueError as e:
+            raise SystemExit(str(e))
     print(f"{C.M}Vylt archive info{C.R}")
-    print(f"Magic      : {magic.decode()}")
-    print(f"Version    : {version}")
-    print(f"Archive ID : {aid.hex()}")
-    print(f"Shard      : {part}/{total}")
-    print(f"Sealed     : {'yes' if sealed else 'no'}")
-    print(f"Meta bytes : {meta_len}")
+    print(f"Magic      : {h.magic.decode()}")
+    print(f"Version    : {h.version}")
+    print(f"Archive ID : {h.aid.hex()}")
+    print(f"Shard      : {h.part}/{h.total}")
+    print(f"Sealed     : {'yes' if h.sealed else 'no'}")
+    print(f"Meta bytes : {h.meta_len}")
+    if h.block_size:
+        print(f"Blocks     : {h.block_count} × {h.block_size >> 10} KiB")
+        print(f"Data bytes : {h.data_len}")
 
 
 # =========================
 # 📄 LIST COMMAND (ADDED)
 # =========================
 def list_cmd(path):
-    with open(path, "rb") as f:
-        hdr = f.read(HEADER_SIZE)
-        magic, _, sealed, _, _, _, meta_len, _, _ = unpack_outer(hdr)
-        meta_blob = f.read(meta_len)
-
-    if magic != b"VYLT":
-        raise SystemExit("Not a Vylt archive")
-
-    if sealed:
-        pwd = retry_password("Metadata password: ")
-        with safe_temp() as enc, safe_temp() as dec:
-            open(enc, "wb").write(meta_blob)
-            decrypt_file(enc, dec, pwd)
-            meta = open(dec, "rb").read()
-    else:
-        meta = meta_blob
+    from .api import open_archive, iter_manifest
 
-    sig, count = struct.unpack(">4sI", meta[:8])
-    if sig != b"VMNF":
-        raise SystemExit("Bad metadata")
+    try:
+        info = open_archive(path)
+    except ValueError as e:
+        raise SystemExit(str(e))
+
+    pwd = retry_password("Metadata password: ") if info.sealed else None
+
+    try:
+        names = list(iter_manifest(path, pwd))
+    except ValueError as e:
+        raise SystemExit(str(e))
 
-    names = [n.decode() for n in meta[8:].split(b"\0") if n][:count]
     for i, n in enumerate(names, 1):
         print(f"{i:3d}. {n}")
 
 
-def decrypt_part(part, password, outdir):
-    outdir = os.path.abspath(outdir)
-    os.makedirs(outdir, exist_ok=True)
+def verify_cmd(files, only, threads):
+    from .integrity import verify_part
+    from .restore import find_parts
+
+    # Only asked for when sealed metadata is needed to name files.
+    pwd = {}
+
+    def password():
+        if "p" not in pwd:
+            pwd["p"] = retry_password("Metadata password: ")
+        return pwd["p"]
+
+    damaged = 0
+    for f in files:
+        for part in find_parts(f):
+            try:
+                r = verify_part(part, password, only, threads)
+            except ValueError as e:
+                raise SystemExit(f"{C.E}✖ {part}: {e}{C.R}")
+
+            blocks = f"{r['checked']}/{r['blocks']} blocks"
+            if r["ok"]:
+                print(f"{C.G}✔ {part}{C.R} {C.D}({blocks}){C.R}")
+                continue
+
+            damaged += 1
+            print(f"{C.E}✖ {part}{C.R} {C.D}({blocks}){C.R}")
+            for start, end in r["bad"]:
+                print(f"   bytes {start}–{end} ({end - start} B)")
+            if r["files"] is None:
+                print(f"   {C.Y}affected files unknown{C.R}")
+            for n in r["files"] or []:
+                print(f"   📄 {n}")
+
+    if damaged:
+        raise SystemExit(1)
+
+
+def plan_cmd(path, threads, parity):
+    from .parallel import plan_encrypt
+
+    mb = 1024 * 1024
+    p = plan_encrypt(path, threads, parity)
+    why = f" — {', '.join(p['reasons'])}" if p["reasons"] else ""
+
+    def space(need, free):
+        if free is not None and free < need:
+            return f" {C.E}(only {free / mb:.2f} MB free){C.R}"
+        return ""
+
+    print(f"{C.M}🧭 Encrypt plan{C.R} {p['path']}")
+    print(f"Files      : {p['files']} ({p['bytes'] / mb:.2f} MB)")
+    print(f"Shards     : {len(p['shards'])} on {p['workers']} worker(s){why}")
+    for s in p["shards"]:
+        print(
+            f"  #{s['part']:03d} {s['files']:>9} files "
+            f"{s['bytes'] / mb:>12.2f} MB → {s['container'] / mb:.2f} MB"
+        )
+    if p["parity"]:
+        print(f"Parity     : {p['parity'] / mb:.2f} MB")
+    print(
+        f"Output     : {p['output'] / mb:.2f} MB in {p['out_dir']}"
+        f"{space(p['output'], p['out_free'])}"
+    )
+    print(
+        f"Scratch    : {p['scratch'] / mb:.2f} MB peak in {p['scratch_dir']}"
+        f"{space(p['scratch'], p['scratch_free'])}"
+    )
+
+    t = p["seconds"]
+    if t is None:
+        print(f"Estimate   : {C.Y}run `vylt setup` to benchmark this machine{C.R}")
+    else:
+        m, sec = divmod(int(round(t)), 60)
+        h, m = divmod(m, 60)
+        if h:
+            took = f"{h}h {m:02d}m {sec:02d}s"
+        elif m:
+            took = f"{m}m {sec:02d}s"
+        else:
+            took = f"{t:.1f}s"
+        print(f"Estimate   : {took} {C.D}(from `vylt setup` benchmark){C.R}")
+
+
+def batch_cmd(jobs_file, threads):
+    from tqdm import tqdm
+    from .batch import load_jobs, run_batch
 
-    with safe_temp() as payload:
-        with open(part, "rb") as f:
-            hdr = f.read(HEADER_SIZE)
-            _, _, _, _, _, _, meta_len, _, _ = unpack_outer(hdr)
-            f.seek(HEADER_SIZE + meta_len)
-            with open(payload, "wb") as o:
-                shutil.copyfileobj(f, o)
+    try:
+        jobs, file_threads = load_jobs(jobs_file)
+    except (OSError, ValueError) as e:
+        raise SystemExit(f"{C.E}✖ {e}{C.R}")
 
-        total = os.path.getsize(payload)
-        stop = threading.Event()
+    pwd = ask_password("Data password: ", confirm=True)
+    bars = []
 
-        tar_name = os.path.splitext(os.path.basename(part))[0] + ".tar"
-        tar_path = os.path.join(outdir, tar_name)
+    def start(n):
+        bars.append(tqdm(
+            total=n, desc="🛡️ Encrypting", unit="shard", colour="magenta",
+        ))
 
-        with tqdm(
-            total=total,
-            unit="B",
-            unit_scale=True,
-            unit_divisor=1024,
-            desc=f"{C.C}🔓 Decrypting{C.R}",
-            dynamic_ncols=True,
-        ) as bar:
-            t = threading.Thread(
-                target=track_progress,
-                args=(tar_path, bar, stop),
-                daemon=True,
-            )
-            t.start()
+    try:
+        res = run_batch(
+            jobs, pwd, pwd, _threads(threads or file_threads or "auto"),
+            start, lambda k, r: bars[0].update(1),
+        )
+    except ValueError as e:
+        raise SystemExit(f"{C.E}✖ {e}{C.R}")
+    finally:
+        for b in bars:
+            b.close()
+
+    for e in res["events"]:
+        print(f"⚙️ Concurrency {e}")
+    for j in res["jobs"]:
+        extra = f", {len(j['parity'])} parity" if j["parity"] else ""
+        print(f"  {C.G}✔{C.R} {j['path']} → {len(j['parts'])} part(s){extra} {C.D}[{j['aid'].hex()}]{C.R}")
+
+    mb = res["bytes"] / (1024 * 1024)
+    dt = max(res["seconds"], 1e-9)
+    why = f" — {', '.join(res['reasons'])}" if res["reasons"] else ""
+    print(
+        f"\n✔ Batch complete\n"
+        f"🗂 Jobs    : {len(res['jobs'])} ({res['shards']} shards)\n"
+        f"⚙️ Workers : {res['workers']}{why}\n"
+        f"📄 Files   : {res['files']} ({res['files']/dt:.0f} files/s)\n"
+        f"📦 Size    : {mb:.2f} MB\n"
+        f"⏱ Time    : {dt:.2f} s\n"
+        f"⚡ Speed   : {mb/dt:.2f} MB/s\n"
+    )
 
-            t0 = time.perf_counter()
-            decrypt_file(payload, tar_path, password)
-            t1 = time.perf_counter()
 
-            stop.set()
-            bar.update(bar.total - bar.n)
+def repair_cmd(path):
+    from .parity import repair
+
+    try:
+        repaired, intact = repair(path)
+    except ValueError as e:
+        raise SystemExit(f"{C.E}✖ {e}{C.R}")
+
+    for p in repaired:
+        print(f"{C.G}✔ Rebuilt{C.R} {p}")
+    if not repaired:
+        print(f"{C.G}✔ All {len(intact)} part(s) intact{C.R}")
+
+
+def _decrypt_bar(size):
+    from tqdm import tqdm
+
+    return tqdm(
+        total=size,
+        unit="B",
+        unit_scale=True,
+        unit_divisor=1024,
+        desc=f"{C.C}🔓 Decrypting{C.R}",
+        dynamic_ncols=True,
+    )
 
-        mb = total / (1024 * 1024)
-        dt = t1 - t0
 
-        print(f"{C.G}✔ Decrypted{C.R} {mb:.2f} MB in {dt:.2f}s ({mb/dt:.2f} MB/s)")
-        print(f"{C.B}→ Extracting{C.R}")
+def decrypt_part(part, password, outdir, bar=True):
+    from .restore import restore_part
 
-        with tarfile.open(tar_path, "r") as tar:
-            tar.extractall(path=outdir)
+    r = restore_part(
+        part, password, outdir, progress=_decrypt_bar if bar else None
+    )
+
+    mb = r["size"] / (1024 * 1024)
+    dt = r["decrypt_seconds"]
+    xt = max(r["extract_seconds"], 1e-9)
+
+    print(f"{C.G}✔ Decrypted{C.R} {mb:.2f} MB in {dt:.2f}s ({mb/dt:.2f} MB/s)")
+    print(f"{C.G}✔ Restored{C.R} {r['entries']} entries in {xt:.2f}s ({r['entries']/xt:.0f}/s)")
+    if r["skipped"]:
+        print(f"{C.Y}⚠️ Skipped {r['skipped']} unsafe or unsupported entries{C.R}")
+    print(f"{C.G}✔ Restored to{C.R} {os.path.abspath(outdir)}\n")
+
+
+def decrypt_parts(jobs, password, threads):
+    """
+    Restore (part, outdir) jobs; `threads` > 1 or "auto" restores
+    several parts at once under the adaptive governor.
+    """
+    if (threads != "auto" and threads <= 1) or len(jobs) == 1:
+        for part, outdir in jobs:
+            decrypt_part(part, password, outdir)
+        return
 
-        os.unlink(tar_path)
+    from concurrent.futures import ThreadPoolExecutor
+    from .sched import Governor, pick_workers, run_gated
 
-        print(f"{C.G}✔ Restored to{C.R} {outdir}\n")
+    if threads == "auto":
+        size = sum(os.path.getsize(p) for p, _ in jobs)
+        threads, why = pick_workers(size, len(jobs))
+        print(f"⚙️ Auto: {threads} part(s) at a time — {', '.join(why)}")
+
+    def run(job):
+        decrypt_part(job[0], password, job[1], bar=False)
+
+    with ThreadPoolExecutor(threads) as ex, Governor(threads) as gov:
+        run_gated(ex, run, jobs, gov)
+    for e in gov.events:
+        print(f"⚙️ Concurrency {e}")
+
+
+def _io_args(parser):
+    g = parser.add_argument_group("background I/O")
+    g.add_argument("--max-read-mbps", type=float, metavar="MB", help="Cap read throughput (MB/s, whole run)")
+    g.add_argument("--max-write-mbps", type=float, metavar="MB", help="Cap write throughput (MB/s, whole run)")
+    g.add_argument("--nice", type=int, metavar="N", help="Raise the CPU nice value by N")
+    g.add_argument("--ioprio", metavar="CLASS[:N]", help="I/O class: idle, be[:0-7] or rt[:0-7] (Linux)")
+    g.add_argument("--drop-cache", action="store_true", help="Evict processed files from the page cache")
+
+
+def _apply_io(a):
+    keys = ("max_read_mbps", "max_write_mbps", "nice", "ioprio", "drop_cache")
+    if not any(getattr(a, k, None) for k in keys):
+        return
+
+    from . import throttle
+
+    throttle.configure(a.max_read_mbps, a.max_write_mbps, a.drop_cache)
+    for apply, value in ((throttle.set_nice, a.nice), (throttle.set_ioprio, a.ioprio)):
+        if not value:
+            continue
+        try:
+            apply(value)
+        except ValueError as e:
+            raise SystemExit(f"{C.E}✖ {e}{C.R}")
+        except OSError as e:
+            print(f"{C.Y}⚠️ Priority not changed: {e}{C.R}", file=sys.stderr)
+
+
+def _threads(value):
+    if value is None:
+        return 1
+    if str(value).lower() == "auto":
+        return "auto"
+    return int(value)
 
 
 def main():
-    print(BANNER)
+    # "-" streams data over stdout, so keep everything else on stderr.
+    streaming = "-" in sys.argv[2:]
+    print(BANNER, file=sys.stderr if streaming else sys.stdout)
 
     p = argparse.ArgumentParser(
         prog="vylt",
@@ -227,9 +396,17 @@ def main():
 Examples:
   vylt encrypt photos/
   vylt encrypt secrets/ --seal-meta
+  vylt encrypt photos/ --threads auto --plan
   vylt decrypt backup.abc123.vylt
   vylt decrypt archive.vylt --out restored/
   vylt list archive.vylt
+  vylt verify archive.vylt --only '*.jpg'
+  vylt encrypt photos/ --threads 8 --parity 2
+  vylt repair photos.abc123.003.vylt
+  vylt batch jobs.json
+  vylt encrypt data/ --max-write-mbps 50 --ioprio idle --nice 10
+  pg_dump db | vylt encrypt - > db.vylt
+  vylt decrypt - < db.vylt | psql db
 
 Tip:
   Use VYLT_PASSWORD env var for non-interactive use.
@@ -243,19 +420,64 @@ Tip:
     s.add_parser("list", help="📄 List files inside archive").add_argument("file")
 
     e = s.add_parser("encrypt", help="🔐 Encrypt file or directory")
-    e.add_argument("path", help="Path to file or directory")
-    e.add_argument("--threads", help="Parallel shards")
+    e.add_argument("path", help="Path to file or directory ('-' = stdin → stdout)")
+    e.add_argument("--threads", help="Parallel shards (number or 'auto')")
+    e.add_argument("--profile", metavar="REPORT", help="Profile every worker and stage into REPORT")
     e.add_argument("--seal-meta", action="store_true", help="Hide filenames")
     e.add_argument("--wipe", action="store_true", help="Securely wipe source")
+    e.add_argument("--parity", type=int, default=0, metavar="K",
+                   help="Write K XOR parity files (any one lost part per group can be rebuilt)")
+    e.add_argument("--plan", action="store_true",
+                   help="Print shard sizes, disk use and time estimate, then exit")
+    _io_args(e)
 
     d = s.add_parser("decrypt", help="🔓 Decrypt archive")
-    d.add_argument("files", nargs="+", help="Archive(s) to decrypt")
+    d.add_argument("files", nargs="+", help="Archive(s) to decrypt ('-' = stdin → stdout)")
     d.add_argument("--out", help="Output directory (default: beside archive)")
+    d.add_argument("--threads", help="Parts restored at once (number or 'auto')")
+    d.add_argument("--profile", metavar="REPORT", help="Profile every part and stage into REPORT")
+    _io_args(d)
+
+    v = s.add_parser("verify", help="🧪 Check archive integrity (no password)")
+    v.add_argument("files", nargs="+", help="Archive(s) to verify")
+    v.add_argument("--only", action="append", metavar="PATTERN",
+                   help="Check only blocks needed to restore matching files")
+    v.add_argument("--threads", type=int, help="Hashing threads")
+
+    b = s.add_parser("batch", help="🗂 Encrypt many roots in one worker pool")
+    b.add_argument("jobs", help="JSON job list")
+    b.add_argument("--threads", help="Workers for all jobs (number or 'auto', default: auto)")
+    b.add_argument("--profile", metavar="REPORT", help="Profile every worker and stage into REPORT")
+    _io_args(b)
+
+    r = s.add_parser("repair", help="🩹 Rebuild a lost/damaged part from parity")
+    r.add_argument("file", help="Any part or parity file of the archive")
 
     a = p.parse_args()
     cfg = VyltConfig.load()
+    _install_signals()
+    _apply_io(a)
+
+    report = getattr(a, "profile", None)
+    if not report:
+        _dispatch(a, cfg)
+        return
+
+    from . import profiling
+
+    d = profiling.start()
+    try:
+        _dispatch(a, cfg)
+    finally:
+        profiling.stop()
+        profiling.report(d, report, " ".join(sys.argv[1:]))
+        print(f"{C.D}• Profile written to {report}{C.R}", file=sys.stderr)
+
 
+def _dispatch(a, cfg):
     if a.cmd == "setup":
+        from .diagnostics import run_diagnostics
+
         run_diagnostics()
         return
 
@@ -267,28 +489,77 @@ Tip:
         list_cmd(a.file)
         return
 
+    if a.cmd == "batch":
+        batch_cmd(a.jobs, a.threads)
+        return
+
+    if a.cmd == "repair":
+        repair_cmd(a.file)
+        return
+
+    if a.cmd == "verify":
+        verify_cmd(a.files, a.only, a.threads)
+        return
+
+    if a.cmd == "encrypt" and a.path == "-":
+        if a.wipe or a.seal_meta or a.threads or a.parity or a.plan:
+            raise SystemExit(f"{C.E}--threads/--seal-meta/--wipe/--parity/--plan do not apply to streams{C.R}")
+        from .stream import encrypt_stream
+
+        pwd = ask_password("Data password: ", confirm=True)
+        _, n, _ = encrypt_stream(sys.stdin.fileno(), sys.stdout.fileno(), pwd)
+        print(f"{C.G}✔ Encrypted stream{C.R} {n} bytes", file=sys.stderr)
+        return
+
+    if a.cmd == "decrypt" and a.files == ["-"]:
+        from .stream import decrypt_stream
+
+        pwd = retry_password("Data password: ")
+        try:
+            decrypt_stream(sys.stdin.fileno(), sys.stdout.fileno(), pwd)
+        except (ValueError, RuntimeError) as e:
+            raise SystemExit(f"{C.E}✖ {e} — discard the output{C.R}")
+        return
+
+    if a.cmd == "encrypt" and a.plan:
+        plan_cmd(a.path, _threads(a.threads or cfg["threads"]), a.parity)
+        return
+
     if a.cmd == "encrypt":
+        from .parallel import encrypt_parallel
+        from .wipe import wipe_tree
+
         pwd = ask_password("Data password: ", confirm=True)
         encrypt_parallel(
             a.path,
             pwd,
             pwd,
-            int(a.threads) if a.threads else cfg["threads"],
+            _threads(a.threads or cfg["threads"]),
             os.urandom(8),
             1 if a.seal_meta else 0,
+            a.parity,
         )
         if a.wipe:
             wipe_tree(a.path)
         return
 
     if a.cmd == "decrypt":
+        from .restore import find_parts
+
+        for f in a.files:
+            if _is_stream(f):
+                raise SystemExit(
+                    f"{C.E}✖ {f} is a stream container — restore it with "
+                    f"`vylt decrypt - < {f} > OUTPUT`{C.R}"
+                )
         pwd = retry_password("Data password: ")
+        jobs = []
         for f in a.files:
             parts = find_parts(f)
             base_dir = os.path.dirname(os.path.abspath(f))
             outdir = os.path.abspath(a.out) if a.out else base_dir
-            for part in parts:
-                decrypt_part(part, pwd, outdir)
+            jobs.extend((part, outdir) for part in parts)
+        decrypt_parts(jobs, pwd, _threads(a.threads))
 
 
 if __name__ == "__main__":
@@ -1,8 +1,16 @@
+import os
 import json
-from pathlib import Path
 
-REPO_ROOT = Path(__file__).resolve().parents[1]
-CONF = REPO_ROOT / ".vylt.json"
+# os.path rather than pathlib: this module is on the CLI's import path.
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.realpath(__file__)))
+CONF = os.path.join(REPO_ROOT, ".vylt.json")
+
+# Machine profile written by `vylt setup` (benchmark results).
+CACHE_DIR = os.path.join(
+    os.environ.get("XDG_CACHE_HOME") or os.path.expanduser("~/.cache"),
+    "vylt",
+)
+PROFILE = os.path.join(CACHE_DIR, "profile.json")
 
 DEFAULT = {
     "threads": 1,
@@ -14,12 +22,16 @@ DEFAULT = {
 }
 
 class VyltConfig:
+    # Parsed once per process; load() hands out copies.
+    _cache = None
+
     @staticmethod
-    def load():
-        if not CONF.exists():
+    def _read():
+        if not os.path.exists(CONF):
             return DEFAULT.copy()
         try:
-            cfg = json.loads(CONF.read_text())
+            with open(CONF) as f:
+                cfg = json.load(f)
             if not isinstance(cfg, dict):
                 return DEFAULT.copy()
             out = DEFAULT.copy()
@@ -27,3 +39,34 @@ class VyltConfig:
             return out
         except Exception:
             return DEFAULT.copy()
+
+    @classmethod
+    def load(cls):
+        if cls._cache is None:
+            cls._cache = cls._read()
+        return cls._cache.copy()
+
+    @classmethod
+    def reload(cls):
+        cls._cache = None
+        return cls.load()
+
+
+def load_profile():
+    """
+    Cached `vylt setup` results, or {} if setup has not been run.
+    """
+    try:
+        with open(PROFILE) as f:
+            prof = json.load(f)
+    except (OSError, ValueError):
+        return {}
+    return prof if isinstance(prof, dict) else {}
+
+
+def save_profile(prof):
+    os.makedirs(CACHE_DIR, exist_ok=True)
+    tmp = PROFILE + ".tmp"
+    with open(tmp, "w") as f:
+        json.dump(prof, f, indent=2)
+    os.replace(tmp, PROFILE)
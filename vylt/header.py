@@ -17,6 +17,7 @@ https://www.apache.org/licenses/LICENSE-2.0
 """
 
 import struct
+from collections import namedtuple
 
 # -------------------------
 # Constants
@@ -24,6 +25,7 @@ import struct
 
 MAGIC = b"VYLT"
 VERSION = 1
+BLOCK_VERSION = 2
 
 # Header layout (big-endian):
 #
@@ -43,6 +45,80 @@ HEADER_FMT = ">4sBB8sHHI32s32s"
 HEADER_SIZE = struct.calcsize(HEADER_FMT)
 
 
+# Version 2 (block integrity) appends to the v1 fields:
+#
+# 86–89  : BLOCK SIZE   (I)
+# 90–93  : BLOCK COUNT  (I)
+# 94–101 : DATA LENGTH  (Q)    encrypted payload size
+#
+# and DATA HASH holds the Merkle root over a table of per-block
+# SHA-256 digests stored between the metadata and the payload:
+#
+#   header | meta (META LENGTH) | block table (BLOCK COUNT × 32) | payload
+
+EXT_FMT = ">IIQ"
+EXT_SIZE = struct.calcsize(EXT_FMT)
+
+
+class Layout(namedtuple(
+    "Layout",
+    "magic version sealed aid part total meta_len meta_hash data_hash "
+    "block_size block_count data_len header_size",
+)):
+    """Parsed outer header plus the derived section offsets."""
+    __slots__ = ()
+
+    @property
+    def table_off(self):
+        return self.header_size + self.meta_len
+
+    @property
+    def data_off(self):
+        return self.table_off + 32 * self.block_count
+
+
+# Stream container (pipes; nothing up front depends on the payload):
+#
+#  0–3   : MAGIC        (4s)   b"VYLS"
+#  4     : VERSION      (B)
+#  5–12  : ARCHIVE ID   (8s)
+#  ...   : ciph payload (unbounded)
+#
+# Trailer (last 44 bytes):
+#
+#  0–7   : DATA LENGTH  (Q)    payload bytes
+#  8–39  : DATA HASH    (32s)  sha256(encrypted payload)
+# 40–43  : END          (4s)   b"VEND"
+
+STREAM_MAGIC = b"VYLS"
+STREAM_END = b"VEND"
+STREAM_FMT = ">4sB8s"
+STREAM_SIZE = struct.calcsize(STREAM_FMT)
+TRAILER_FMT = ">Q32s4s"
+TRAILER_SIZE = struct.calcsize(TRAILER_FMT)
+
+
+# Parity file (.vpar), one per parity group:
+#
+#  0–3   : MAGIC        (4s)   b"VPAR"
+#  4     : VERSION      (B)
+#  5–12  : ARCHIVE ID   (8s)
+# 13–14  : TOTAL PARTS  (H)
+# 15–16  : GROUP NO     (H)
+# 17–18  : GROUPS       (H)
+# 19–20  : MEMBERS      (H)
+#
+# then per member: PART NO (H), LENGTH (Q), SHA-256 of the whole part
+# file (32s); then the XOR of all member files, zero-padded to the
+# longest one.
+
+PARITY_MAGIC = b"VPAR"
+PARITY_FMT = ">4sB8sHHHH"
+PARITY_SIZE = struct.calcsize(PARITY_FMT)
+MEMBER_FMT = ">HQ32s"
+MEMBER_SIZE = struct.calcsize(MEMBER_FMT)
+
+
 # -------------------------
 # Builders
 # -------------------------
@@ -55,9 +131,14 @@ def pack_outer(
     meta_len: int,
     meta_hash: bytes,
     data_hash: bytes,
+    block_size: int = 0,
+    block_count: int = 0,
+    data_len: int = 0,
 ):
     """
     Build Vylt outer header.
+    With `block_size`, builds a v2 header and `data_hash` is the
+    Merkle root of the block table.
     """
     if len(aid) != 8:
         raise ValueError("Archive ID must be 8 bytes")
@@ -65,10 +146,10 @@ def pack_outer(
     if len(meta_hash) != 32 or len(data_hash) != 32:
         raise ValueError("Hashes must be SHA-256 (32 bytes)")
 
-    return struct.pack(
+    hdr = struct.pack(
         HEADER_FMT,
         MAGIC,
-        VERSION,
+        BLOCK_VERSION if block_size else VERSION,
         sealed,
         aid,
         part,
@@ -77,6 +158,44 @@ def pack_outer(
         meta_hash,
         data_hash,
     )
+    if block_size:
+        hdr += struct.pack(EXT_FMT, block_size, block_count, data_len)
+    return hdr
+
+
+def pack_stream(aid: bytes):
+    """
+    Build Vylt stream container header.
+    """
+    if len(aid) != 8:
+        raise ValueError("Archive ID must be 8 bytes")
+
+    return struct.pack(STREAM_FMT, STREAM_MAGIC, VERSION, aid)
+
+
+def pack_trailer(length: int, data_hash: bytes):
+    """
+    Build Vylt stream container trailer.
+    """
+    if len(data_hash) != 32:
+        raise ValueError("Hashes must be SHA-256 (32 bytes)")
+
+    return struct.pack(TRAILER_FMT, length, data_hash, STREAM_END)
+
+
+def pack_parity(aid: bytes, total: int, group: int, groups: int, members):
+    """
+    Build Vylt parity file header.
+    `members` is a list of (part, length, sha256).
+    """
+    if len(aid) != 8:
+        raise ValueError("Archive ID must be 8 bytes")
+
+    hdr = struct.pack(
+        PARITY_FMT, PARITY_MAGIC, VERSION, aid, total, group, groups,
+        len(members),
+    )
+    return hdr + b"".join(struct.pack(MEMBER_FMT, *m) for m in members)
 
 
 # -------------------------
@@ -95,16 +214,129 @@ def unpack_outer(buf: bytes):
     return struct.unpack(HEADER_FMT, buf)
 
 
+def read_outer(f):
+    """
+    Read a v1 or v2 outer header from the current position of `f`.
+    Returns a Layout.
+    """
+    fields = unpack_outer(f.read(HEADER_SIZE))
+    if fields[0] != MAGIC:
+        raise ValueError("Not a Vylt archive")
+
+    if fields[1] >= BLOCK_VERSION:
+        ext = f.read(EXT_SIZE)
+        if len(ext) != EXT_SIZE:
+            raise ValueError("Buffer too small for Vylt header")
+        return Layout(*fields, *struct.unpack(EXT_FMT, ext), HEADER_SIZE + EXT_SIZE)
+
+    return Layout(*fields, 0, 0, 0, HEADER_SIZE)
+
+
+def unpack_stream(buf: bytes):
+    """
+    Parse Vylt stream container header.
+    Returns:
+      magic, version, aid
+    """
+    if len(buf) < STREAM_SIZE:
+        raise ValueError("Buffer too small for Vylt stream header")
+
+    return struct.unpack(STREAM_FMT, buf[:STREAM_SIZE])
+
+
+def unpack_trailer(buf: bytes):
+    """
+    Parse Vylt stream container trailer.
+    Returns:
+      length, data_hash
+    """
+    if len(buf) != TRAILER_SIZE:
+        raise ValueError("Truncated Vylt stream")
+
+    length, data_hash, end = struct.unpack(TRAILER_FMT, buf)
+    if end != STREAM_END:
+        raise ValueError("Truncated Vylt stream")
+    return length, data_hash
+
+
+def read_parity(f):
+    """
+    Read a parity file header from the start of `f`.
+    Returns:
+      aid, total, group, groups, members, header_size
+    """
+    buf = f.read(PARITY_SIZE)
+    if len(buf) != PARITY_SIZE or buf[:4] != PARITY_MAGIC:
+        raise ValueError("Not a Vylt parity file")
+
+    _, _, aid, total, group, groups, count = struct.unpack(PARITY_FMT, buf)
+    table = f.read(count * MEMBER_SIZE)
+    if len(table) != count * MEMBER_SIZE:
+        raise ValueError("Truncated Vylt parity file")
+
+    members = [
+        struct.unpack(MEMBER_FMT, table[i:i + MEMBER_SIZE])
+        for i in range(0, len(table), MEMBER_SIZE)
+    ]
+    return aid, total, group, groups, members, PARITY_SIZE + len(table)
+
+
 # -------------------------
 # Metadata builder
 # -------------------------
 
-def build_manifest(files):
+def build_manifest(files, index=None):
     """
     Build Vylt metadata manifest (PLAIN).
     Format:
-      VMNF | count | NUL-separated paths
+      VMNF | count | NUL-separated paths [ | NUL | VIDX index ]
+
+    `index` is (tar_size, [(start, end), ...]) with each file's byte
+    range in the plaintext tar, in `files` order. Readers that only
+    know VMNF stop after `count` paths and never see it.
     """
     head = struct.pack(">4sI", b"VMNF", len(files))
     body = b"\0".join(f.encode() for f in files)
-    return head + body
+    if index is None:
+        return head + body
+
+    tar_size, ranges = index
+    flat = [x for r in ranges for x in r]
+    idx = struct.pack(">4sQI", b"VIDX", tar_size, len(ranges))
+    idx += struct.pack(f">{len(flat)}Q", *flat)
+    return head + body + b"\0" + idx
+
+
+def parse_manifest(meta):
+    """
+    Parse a PLAIN Vylt manifest into its list of paths.
+    """
+    if len(meta) < 8:
+        raise ValueError("Bad metadata")
+
+    sig, count = struct.unpack(">4sI", meta[:8])
+    if sig != b"VMNF":
+        raise ValueError("Bad metadata")
+
+    if not count:
+        return []
+    # An index may follow the paths; never decode past them.
+    return [n.decode() for n in meta[8:].split(b"\0", count)[:count]]
+
+
+def parse_index(meta):
+    """
+    Return (tar_size, [(start, end), ...]) from a PLAIN manifest, or
+    None if it carries no index.
+    """
+    _, count = struct.unpack(">4sI", meta[:8])
+    if not count:
+        return None
+    rest = meta[8:].split(b"\0", count)
+    if len(rest) <= count or not rest[count].startswith(b"VIDX"):
+        return None
+
+    idx = rest[count]
+    _, tar_size, n = struct.unpack(">4sQI", idx[:16])
+    flat = struct.unpack(f">{2 * n}Q", idx[16:16 + 16 * n])
+    return tar_size, list(zip(flat[0::2], flat[1::2]))
@@ -0,0 +1,279 @@
+import os
+import mmap
+import fnmatch
+import hashlib
+from concurrent.futures import ThreadPoolExecutor
+
+from .header import BLOCK_VERSION, read_outer, parse_manifest, parse_index
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+BLOCK_SIZE = 1024 * 1024
+# hashlib drops the GIL on large buffers, so threads hash in parallel.
+HASHERS = min(8, os.cpu_count() or 1)
+CHUNK = 1024 * 1024
+
+
+# -------------------------
+# Merkle tree
+# -------------------------
+#
+# Leaves are sha256(0x00 | block); inner nodes sha256(0x01 | left | right).
+# An odd node at the end of a level is carried up unchanged.
+
+def leaf(data):
+    h = hashlib.sha256(b"\0")
+    h.update(data)
+    return h.digest()
+
+
+def merkle_root(leaves):
+    level = list(leaves)
+    if not level:
+        return hashlib.sha256(b"").digest()
+
+    while len(level) > 1:
+        nxt = [
+            hashlib.sha256(b"\1" + level[i] + level[i + 1]).digest()
+            for i in range(0, len(level) - 1, 2)
+        ]
+        if len(level) % 2:
+            nxt.append(level[-1])
+        level = nxt
+
+    return level[0]
+
+
+def block_count(length, block_size=BLOCK_SIZE):
+    return -(-length // block_size)
+
+
+def hash_blocks(path, offset, length, block_size=BLOCK_SIZE, indices=None,
+                workers=None, rd=None):
+    """
+    Leaf digests of the `block_size` blocks of `path[offset:offset+length]`
+    (only `indices`, if given, in that order). Blocks are hashed straight
+    out of an mmap by a thread pool. A short file yields short blocks,
+    which simply fail to match. `rd` (a throttle.Bucket) is charged for
+    every block read.
+    """
+    n = block_count(length, block_size)
+    indices = range(n) if indices is None else indices
+    end = offset + length
+
+    with open(path, "rb") as f:
+        fd = f.fileno()
+        try:
+            mm = mmap.mmap(fd, 0, access=mmap.ACCESS_READ)
+            view = memoryview(mm)
+        except (OSError, ValueError):
+            # Empty file, or a filesystem without mmap.
+            mm = view = None
+
+        def one(i):
+            s = offset + i * block_size
+            e = min(s + block_size, end)
+            if rd:
+                rd.take(max(0, e - s))
+            if view is None:
+                return leaf(os.pread(fd, e - s, s))
+            with view[s:e] as blk:
+                return leaf(blk)
+
+        try:
+            with ThreadPoolExecutor(workers or HASHERS) as ex:
+                return list(ex.map(one, indices))
+        finally:
+            if view is not None:
+                view.release()
+                mm.close()
+
+
+# -------------------------
+# Verification
+# -------------------------
+
+def _ranges(indices, base, size, limit):
+    """Merge sorted item indices into absolute (start, end) byte ranges."""
+    out = []
+    for i in indices:
+        s = base + i * size
+        e = min(s + size, limit)
+        if out and out[-1][1] == s:
+            out[-1] = (out[-1][0], e)
+        else:
+            out.append((s, e))
+    return out
+
+
+def _match(name, patterns):
+    return any(
+        fnmatch.fnmatch(name, p) or fnmatch.fnmatch(name, "*/" + p.lstrip("/"))
+        for p in patterns
+    )
+
+
+def _to_cipher(pos, tar_size, data_len):
+    # ciph output grows linearly with its input, so plaintext offsets
+    # map onto the payload proportionally (callers add _slack()).
+    return pos * data_len // max(tar_size, 1)
+
+
+def _slack(tar_size, data_len, block_size):
+    # ciph only adds framing (a header and per-chunk tags): plaintext
+    # byte p sits between p and p + overhead in the payload, so the
+    # proportional map is off by at most the total overhead.
+    return min(block_size, max(0, data_len - tar_size))
+
+
+def _read_manifest(meta, sealed, password):
+    if sealed:
+        if callable(password):
+            password = password()
+        if password is None:
+            return None
+        from .ciphwrap import decrypt_bytes
+
+        try:
+            meta = decrypt_bytes(meta, password)
+        except RuntimeError:
+            # Wrong password: damage is still reported, files unknown.
+            return None
+    return parse_manifest(meta), parse_index(meta)
+
+
+def _affected(manifest, blocks, block_size, data_len):
+    names, index = manifest
+    if index is None:
+        return names
+    tar_size, spans = index
+    slack = _slack(tar_size, data_len, block_size)
+    hit = []
+    for name, (s, e) in zip(names, spans):
+        cs = _to_cipher(s, tar_size, data_len) - slack
+        ce = _to_cipher(e, tar_size, data_len) + slack
+        if any(cs < (b + 1) * block_size and ce > b * block_size for b in blocks):
+            hit.append(name)
+    return hit
+
+
+def verify_part(path, password=None, patterns=None, workers=None):
+    """
+    Check one container part against its header.
+
+    v2 parts are checked block by block in parallel. With `patterns`,
+    only the blocks a selective restore of the matching files needs are
+    checked: ciph decrypts front to back, so that is every block up to
+    the end of the last match. v1 parts can only be hashed whole.
+
+    `password` (bytes, or a callable returning bytes) is used only when
+    sealed metadata is needed to name files.
+
+    Returns a dict; "bad" lists damaged (start, end) byte ranges of the
+    file and "files" the paths stored there (None if unknown).
+    """
+    path = os.fspath(path)
+    size = os.path.getsize(path)
+
+    with open(path, "rb") as f:
+        lay = read_outer(f)
+        meta = f.read(lay.meta_len)
+        table = f.read(32 * lay.block_count)
+
+    bad = []
+    meta_ok = (
+        len(meta) == lay.meta_len
+        and hashlib.sha256(meta).digest() == lay.meta_hash
+    )
+    if not meta_ok:
+        bad.append((lay.header_size, lay.table_off))
+
+    cache = {}
+
+    def manifest():
+        if "m" not in cache:
+            cache["m"] = (
+                _read_manifest(meta, lay.sealed, password) if meta_ok else None
+            )
+        return cache["m"]
+
+    if lay.version < BLOCK_VERSION:
+        h = hashlib.sha256()
+        with open(path, "rb") as f:
+            f.seek(lay.data_off)
+            for b in iter(lambda: f.read(CHUNK), b""):
+                h.update(b)
+        damaged = h.digest() != lay.data_hash
+        if damaged:
+            bad.append((lay.data_off, size))
+        m = manifest() if damaged else None
+        return {
+            "path": path,
+            "version": lay.version,
+            "blocks": 1,
+            "checked": 1,
+            "bad": bad,
+            "files": (m[0] if m else None) if damaged else [],
+            "ok": not bad,
+        }
+
+    bs, n, data_len = lay.block_size, lay.block_count, lay.data_len
+    end = lay.data_off + data_len
+    leaves = [table[i:i + 32] for i in range(0, len(table), 32)]
+    table_ok = len(leaves) == n and merkle_root(leaves) == lay.data_hash
+
+    want = range(n)
+    if patterns:
+        m = manifest()
+        if m is None or m[1] is None:
+            raise ValueError("Partial verify needs a readable file index")
+        names, (tar_size, spans) = m
+        last = max(
+            (e for name, (_, e) in zip(names, spans) if _match(name, patterns)),
+            default=None,
+        )
+        if last is None:
+            raise ValueError("No files match")
+        reach = _to_cipher(last, tar_size, data_len) + _slack(tar_size, data_len, bs)
+        want = range(min(n, reach // bs + 1))
+
+    if table_ok:
+        got = hash_blocks(path, lay.data_off, data_len, bs, want, workers)
+        blocks = [i for i, d in zip(want, got) if d != leaves[i]]
+    else:
+        # The table does not match the header root: hash everything to
+        # tell a damaged table apart from a damaged payload.
+        want = range(n)
+        got = hash_blocks(path, lay.data_off, data_len, bs, None, workers)
+        diff = [i for i, d in enumerate(got) if i >= len(leaves) or d != leaves[i]]
+        if merkle_root(got) == lay.data_hash:
+            bad += _ranges(diff, lay.table_off, 32, lay.data_off)
+            blocks = []
+        elif not diff:
+            bad.append((0, lay.header_size))
+            blocks = []
+        else:
+            bad.append((lay.table_off, lay.data_off))
+            blocks = diff
+
+    bad += _ranges(blocks, lay.data_off, bs, end)
+    if size > end:
+        bad.append((end, size))
+
+    files = []
+    if blocks:
+        m = manifest()
+        files = _affected(m, blocks, bs, data_len) if m else None
+
+    return {
+        "path": path,
+        "version": lay.version,
+        "blocks": n,
+        "checked": len(want),
+        "bad": sorted(bad),
+        "files": files,
+        "ok": not bad,
+    }
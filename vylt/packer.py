@@ -0,0 +1,307 @@
+import os
+import stat
+import struct
+import tarfile
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+
+from . import throttle
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+# Files at or below SMALL_FILE are read whole by the readahead pool.
+# Larger ones are streamed on the packing thread through one reused buffer.
+SMALL_FILE = 256 * 1024
+READAHEAD = 256
+READERS = 8
+CHUNK = 1024 * 1024
+
+_NUL = bytes(tarfile.RECORDSIZE)
+
+_USTAR = struct.Struct("100s8s8s8s12s12s8sc100s8s32s32s8s8s155s12s")
+_MAGIC = tarfile.POSIX_MAGIC
+_MAX8 = 8 ** 7
+_MAX12 = 8 ** 11
+_FAST = (tarfile.REGTYPE, tarfile.SYMTYPE)
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def arcnames(files, start=None):
+    """
+    Yield archive names relative to `start` (default: cwd).
+    Same result as os.path.relpath for normalized absolute paths,
+    without the per-file normpath/split work.
+    """
+    start = os.getcwd() if start is None else start
+    prefix = start.rstrip(os.sep) + os.sep
+    cut = len(prefix)
+    for f in files:
+        if f.startswith(prefix):
+            yield f[cut:]
+        else:
+            yield os.path.relpath(f, start)
+
+
+def tar_size(sizes):
+    """
+    Size of the tar pack() writes for regular files of `sizes` bytes
+    (one 512-byte header each; long names that need an extension
+    header are not counted).
+    """
+    bs = tarfile.BLOCKSIZE
+    n = sum(bs + -(-s // bs) * bs for s in sizes) + 2 * bs
+    return n + -n % tarfile.RECORDSIZE
+
+
+def _load(path):
+    st = os.lstat(path)
+    if not stat.S_ISREG(st.st_mode) or st.st_size > SMALL_FILE:
+        return st, None
+
+    fd = os.open(path, os.O_RDONLY)
+    try:
+        data = os.read(fd, st.st_size)
+        while len(data) < st.st_size:
+            more = os.read(fd, st.st_size - len(data))
+            if not more:
+                raise OSError(f"unexpected end of data: {path}")
+            data += more
+        rd = throttle.limits()[0]
+        if rd:
+            rd.take(st.st_size)
+        throttle.drop(fd)
+    finally:
+        os.close(fd)
+    return st, data
+
+
+def _ustar(name, mode, uid, gid, size, mtime, kind, link, uname, gname):
+    """
+    Plain ustar header for the common case, or None when the entry needs
+    pax/gnu extensions (long or non-ASCII names, large ids or sizes).
+    Avoids TarInfo.tobuf(), which emits a pax record for every float mtime.
+    """
+    if not (name.isascii() and link.isascii() and uname.isascii()
+            and gname.isascii()):
+        return None
+    if (uid >= _MAX8 or gid >= _MAX8 or size >= _MAX12
+            or not 0 <= mtime < _MAX12 or len(link) > 100
+            or len(uname) > 32 or len(gname) > 32):
+        return None
+
+    raw = name.encode()
+    prefix = b""
+    if len(raw) > 100:
+        cut = raw.rfind(b"/", 0, 156)
+        if cut <= 0 or len(raw) - cut - 1 > 100:
+            return None
+        prefix, raw = raw[:cut], raw[cut + 1:]
+
+    hdr = _USTAR.pack(
+        raw,
+        b"%07o\0" % mode,
+        b"%07o\0" % uid,
+        b"%07o\0" % gid,
+        b"%011o\0" % size,
+        b"%011o\0" % mtime,
+        b"        ",
+        kind,
+        link.encode(),
+        _MAGIC,
+        uname.encode(),
+        gname.encode(),
+        b"%07o\0" % 0,
+        b"%07o\0" % 0,
+        prefix,
+        b"",
+    )
+    return b"%s%06o\0 %s" % (hdr[:148], sum(hdr), hdr[156:])
+
+
+class _Owners:
+    """uid/gid → name lookups, cached for the whole pack."""
+
+    def __init__(self):
+        self.users = {}
+        self.groups = {}
+        try:
+            import grp
+            import pwd
+        except ImportError:
+            pwd = grp = None
+        self.pwd = pwd
+        self.grp = grp
+
+    def user(self, uid):
+        name = self.users.get(uid)
+        if name is None:
+            name = ""
+            if self.pwd:
+                try:
+                    name = self.pwd.getpwuid(uid)[0]
+                except KeyError:
+                    pass
+            self.users[uid] = name
+        return name
+
+    def group(self, gid):
+        name = self.groups.get(gid)
+        if name is None:
+            name = ""
+            if self.grp:
+                try:
+                    name = self.grp.getgrgid(gid)[0]
+                except KeyError:
+                    pass
+            self.groups[gid] = name
+        return name
+
+
+# -------------------------
+# Packer
+# -------------------------
+
+def pack(tar_path, files, names=None, index=None):
+    """
+    Write `files` as a standard tar archive at `tar_path`.
+
+    Produces the same members as tarfile.add() (regular files, symlinks,
+    fifos and devices; sockets are skipped), but reads small files ahead
+    on a thread pool, builds plain ustar headers directly (falling back to
+    one reused TarInfo for long names and special files), streams large
+    files through one copy buffer, and writes padding straight to a
+    buffered file. Mtimes are stored at whole-second precision.
+
+    If `index` is a list, one (start, end) tar byte range per input
+    file (header through last data byte) is appended to it; skipped
+    files get an empty range.
+
+    Returns the number of members written.
+    """
+    if names is None:
+        names = arcnames(files)
+
+    fmt = tarfile.DEFAULT_FORMAT
+    enc = tarfile.ENCODING
+    owners = _Owners()
+    info = tarfile.TarInfo()
+    buf = bytearray(CHUNK)
+    view = memoryview(buf)
+    count = 0
+    off = 0
+    rd, wr = throttle.limits()
+
+    with open(tar_path, "wb", buffering=CHUNK) as out, \
+            ThreadPoolExecutor(READERS) as ex:
+        todo = iter(zip(files, names))
+        pending = deque()
+
+        def fill():
+            while len(pending) < READAHEAD:
+                nxt = next(todo, None)
+                if nxt is None:
+                    return
+                pending.append((nxt[0], nxt[1], ex.submit(_load, nxt[0])))
+
+        fill()
+        while pending:
+            path, name, fut = pending.popleft()
+            fill()
+            st, data = fut.result()
+            mode = st.st_mode
+            arc = name.replace(os.sep, "/").lstrip("/")
+            size = 0
+            link = ""
+
+            if stat.S_ISREG(mode):
+                kind = tarfile.REGTYPE
+                size = st.st_size
+            elif stat.S_ISLNK(mode):
+                kind = tarfile.SYMTYPE
+                link = os.readlink(path)
+            elif stat.S_ISDIR(mode):
+                kind = tarfile.DIRTYPE
+            elif stat.S_ISFIFO(mode):
+                kind = tarfile.FIFOTYPE
+            elif stat.S_ISCHR(mode):
+                kind = tarfile.CHRTYPE
+            elif stat.S_ISBLK(mode):
+                kind = tarfile.BLKTYPE
+            else:
+                if index is not None:
+                    index.append((off, off))
+                continue
+
+            uname = owners.user(st.st_uid)
+            gname = owners.group(st.st_gid)
+            hdr = None
+            if kind in _FAST:
+                hdr = _ustar(
+                    arc, stat.S_IMODE(mode), st.st_uid, st.st_gid, size,
+                    int(st.st_mtime), kind, link, uname, gname,
+                )
+            if hdr is None:
+                info.name = arc
+                info.mode = stat.S_IMODE(mode)
+                info.uid = st.st_uid
+                info.gid = st.st_gid
+                info.uname = uname
+                info.gname = gname
+                info.mtime = st.st_mtime
+                info.size = size
+                info.type = kind
+                info.linkname = link
+                info.devmajor = info.devminor = 0
+                if kind in (tarfile.CHRTYPE, tarfile.BLKTYPE):
+                    info.devmajor = os.major(st.st_rdev)
+                    info.devminor = os.minor(st.st_rdev)
+                hdr = info.tobuf(fmt, enc, "surrogateescape")
+            out.write(hdr)
+            count += 1
+            start = off
+            off += len(hdr)
+
+            if kind != tarfile.REGTYPE:
+                if index is not None:
+                    index.append((start, off))
+                continue
+
+            if data is not None:
+                out.write(data)
+            else:
+                left = size
+                with open(path, "rb", buffering=0) as f:
+                    while left:
+                        n = f.readinto(view[:min(CHUNK, left)])
+                        if not n:
+                            raise OSError(f"unexpected end of data: {path}")
+                        if rd:
+                            rd.take(n)
+                        out.write(view[:n])
+                        left -= n
+                    throttle.drop(f.fileno())
+
+            off += size
+            if index is not None:
+                index.append((start, off))
+            if wr:
+                wr.take(off - start)
+
+            pad = -size % tarfile.BLOCKSIZE
+            if pad:
+                out.write(_NUL[:pad])
+                off += pad
+
+        # End-of-archive marker, padded to a full record like tarfile.close().
+        out.write(_NUL[:2 * tarfile.BLOCKSIZE])
+        pad = -out.tell() % tarfile.RECORDSIZE
+        if pad:
+            out.write(_NUL[:pad])
+
+    return count
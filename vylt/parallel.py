@@ -1,16 +1,29 @@
 import os
+import stat
 import time
-import tarfile
 import tempfile
 import shutil
+import heapq
 import hashlib
 import threading
 from concurrent.futures import ProcessPoolExecutor
 from tqdm import tqdm
 
-from .header import pack_outer, build_manifest
+from .header import HEADER_SIZE, EXT_SIZE, pack_outer, build_manifest
 from .ciphwrap import encrypt_file
+from . import throttle
 from .fileprogress import track_progress
+from .profiling import stage
+from .packer import pack, arcnames, tar_size
+from .integrity import BLOCK_SIZE, block_count, hash_blocks, merkle_root
+from .sched import (
+    Governor,
+    estimate_seconds,
+    pick_workers,
+    run_gated,
+    scratch_free,
+    shard_count,
+)
 
 
 def sha256_file(path):
@@ -43,43 +56,11 @@ def check_disk_space(path):
     _, _, free = shutil.disk_usage(os.getcwd())
     if free < total:
         raise SystemExit("❌ Not enough disk space")
+    return total
 
 
-def worker(args):
-    files, out, data_pwd, meta_pwd, aid, part, total, seal = args
-
-    with tempfile.NamedTemporaryFile(delete=False) as t:
-        tar_path = t.name
-
-    with tarfile.open(tar_path, "w") as tar:
-        for f in files:
-            tar.add(f, arcname=os.path.relpath(f))
-
-    manifest = build_manifest(files)
-
-    if seal:
-        mp = tempfile.NamedTemporaryFile(delete=False)
-        me = tempfile.NamedTemporaryFile(delete=False)
-        mp.close()
-        me.close()
-
-        with open(mp.name, "wb") as m:
-            m.write(manifest)
-
-        encrypt_file(mp.name, me.name, meta_pwd)
-        meta_len = os.path.getsize(me.name)
-        meta_hash = sha256_file(me.name)
-    else:
-        meta_len = len(manifest)
-        meta_hash = hashlib.sha256(manifest).digest()
-
-    ep = tempfile.NamedTemporaryFile(delete=False)
-    ep.close()
-
-    size = os.path.getsize(tar_path)
-    stop = threading.Event()
-
-    with tqdm(
+def _encrypt_bar(size):
+    return tqdm(
         total=size,
         unit="B",
         unit_scale=True,
@@ -87,93 +68,254 @@ def worker(args):
         desc="🛡️ Encrypting",
         colour="magenta",
         dynamic_ncols=True,
-    ) as bar:
-        t = threading.Thread(
-            target=track_progress,
-            args=(ep.name, bar, stop),
-            daemon=True,
+    )
+
+
+def _shape(size, count, threads):
+    """(shards, workers, reasons) for `threads` = count or "auto"."""
+    if threads == "auto":
+        workers, why = pick_workers(
+            size, count, shard_bytes=lambda w: size / shard_count(w, count)
         )
-        t.start()
+        n = shard_count(workers, count) if workers > 1 else 1
+        return n, workers, why
+    n = threads if threads > 1 else 1
+    return n, n, []
+
+
+def _sizes(files):
+    """Bytes each file adds to a tar (0 for links and special files)."""
+    sizes = {}
+    for f in files:
+        st = os.lstat(f)
+        sizes[f] = st.st_size if stat.S_ISREG(st.st_mode) else 0
+    return sizes
+
+
+def plan_shards(path, files, n, aid, dest=None, sizes=None):
+    """
+    Split `files` into at most `n` non-empty shards of similar size
+    named `<base>.<aid>[.NNN].vylt` in `dest` (default: beside `path`).
+    Files go largest first to the lightest shard; each shard keeps the
+    walk order. `sizes` maps files to bytes (default: lstat).
+
+    Returns [(files, out, part, total), ...].
+    """
+    parent = os.path.dirname(path) if dest is None else dest
+    base = os.path.basename(path)
+    sizes = _sizes(files) if sizes is None else sizes
+
+    n = max(1, min(n, len(files)))
+    # (bytes, files, shard): equal loads go to the shard with fewer
+    # files, so empty files still spread out.
+    heap = [(0, 0, i) for i in range(n)]
+    picks = [[] for _ in range(n)]
+    order = sorted(range(len(files)), key=lambda k: sizes[files[k]], reverse=True)
+    for k in order:
+        load, count, i = heapq.heappop(heap)
+        picks[i].append(k)
+        heapq.heappush(heap, (load + sizes[files[k]], count + 1, i))
+    buckets = [[files[k] for k in sorted(p)] for p in picks if p]
+    total = len(buckets)
+
+    shards = []
+    for i, b in enumerate(buckets, 1):
+        if total == 1:
+            name = f"{base}.{aid.hex()}.vylt"
+        else:
+            name = f"{base}.{aid.hex()}.{i:03d}.vylt"
+        shards.append((b, os.path.join(parent, name), i, total))
+    return shards
+
+
+def encrypt_part(
+    files, out, data_pwd, meta_pwd, aid, part, total, seal,
+    start=None, progress=None,
+):
+    """
+    Pack `files`, encrypt them and write one container to `out`
+    (a path or a writable binary file object).
+
+    Archive names are relative to `start` (default: cwd). `progress`,
+    if given, is called with the tar size and must return a context
+    manager yielding a tqdm-like bar.
+
+    Returns a dict of per-part statistics.
+    """
+    temps = []
+
+    def temp():
+        fd, p = tempfile.mkstemp()
+        os.close(fd)
+        temps.append(p)
+        return p
+
+    rd, wr = throttle.limits()
+
+    try:
+        tar_path = temp()
+
+        p0 = time.perf_counter()
+        spans = []
+        with stage("pack"):
+            count = pack(tar_path, files, arcnames(files, start), spans)
+        p1 = time.perf_counter()
+
+        size = os.path.getsize(tar_path)
+        manifest = build_manifest(files, (size, spans))
+
+        with stage("meta"):
+            if seal:
+                mp, me = temp(), temp()
+                with open(mp, "wb") as m:
+                    m.write(manifest)
+
+                encrypt_file(mp, me, meta_pwd)
+                meta_len = os.path.getsize(me)
+                meta_hash = sha256_file(me)
+            else:
+                meta_len = len(manifest)
+                meta_hash = hashlib.sha256(manifest).digest()
+
+        ep = temp()
 
         t0 = time.perf_counter()
-        encrypt_file(tar_path, ep.name, data_pwd)
+        with stage("encrypt"):
+            if progress is None:
+                encrypt_file(tar_path, ep, data_pwd, rd, wr)
+            else:
+                with progress(size) as bar:
+                    stop = threading.Event()
+                    t = threading.Thread(
+                        target=track_progress,
+                        args=(ep, bar, stop),
+                        daemon=True,
+                    )
+                    t.start()
+                    try:
+                        encrypt_file(tar_path, ep, data_pwd, rd, wr)
+                    finally:
+                        stop.set()
+                        t.join()
+            data_len = os.path.getsize(ep)
         t1 = time.perf_counter()
 
-        stop.set()
-        t.join()
+        with stage("hash"):
+            leaves = hash_blocks(ep, 0, data_len, BLOCK_SIZE, rd=rd)
+        hdr = pack_outer(
+            aid,
+            part,
+            total,
+            1 if seal else 0,
+            meta_len,
+            meta_hash,
+            merkle_root(leaves),
+            BLOCK_SIZE,
+            len(leaves),
+            data_len,
+        )
+
+        own = isinstance(out, (str, os.PathLike))
+        with stage("write"):
+            f = open(out, "wb") if own else out
+            try:
+                f.write(hdr)
+                if seal:
+                    with open(me, "rb") as m:
+                        shutil.copyfileobj(m, f)
+                else:
+                    f.write(manifest)
+                f.write(b"".join(leaves))
+
+                with open(ep, "rb") as d:
+                    throttle.copy(d, f, rd, wr)
+                if own:
+                    f.flush()
+                    throttle.drop(f.fileno(), written=True)
+            finally:
+                if own:
+                    f.close()
+
+        return {
+            "path": os.fspath(out) if own else None,
+            "part": part,
+            "total": total,
+            "files": count,
+            "size": size,
+            "bytes": len(hdr) + meta_len + 32 * len(leaves) + data_len,
+            "pack_seconds": p1 - p0,
+            "encrypt_seconds": t1 - t0,
+        }
+    finally:
+        for p in temps:
+            try:
+                os.unlink(p)
+            except FileNotFoundError:
+                pass
+
 
-    data_hash = sha256_file(ep.name)
+def worker(args):
+    files, out, data_pwd, meta_pwd, aid, part, total, seal, start = args
+
+    r = encrypt_part(
+        files, out, data_pwd, meta_pwd, aid, part, total, seal, start,
+        progress=_encrypt_bar,
+    )
 
-    mb = size / (1024 * 1024)
-    dt = t1 - t0
+    mb = r["size"] / (1024 * 1024)
+    dt = r["encrypt_seconds"]
+    pt = max(r["pack_seconds"], 1e-9)
 
     print(
         f"\n✔ Encryption complete\n"
+        f"📄 Files  : {r['files']} ({r['files']/pt:.0f} files/s packed)\n"
         f"📦 Size   : {mb:.2f} MB\n"
         f"⏱ Time   : {dt:.2f} s\n"
         f"⚡ Speed  : {mb/dt:.2f} MB/s\n"
     )
 
-    with open(out, "wb") as f:
-        f.write(
-            pack_outer(
-                aid,
-                part,
-                total,
-                1 if seal else 0,
-                meta_len,
-                meta_hash,
-                data_hash,
-            )
-        )
-        if seal:
-            with open(me.name, "rb") as m:
-                shutil.copyfileobj(m, f)
-        else:
-            f.write(manifest)
-
-        with open(ep.name, "rb") as d:
-            shutil.copyfileobj(d, f)
 
-    os.unlink(tar_path)
-    os.unlink(ep.name)
-    if seal:
-        os.unlink(mp.name)
-        os.unlink(me.name)
-
-
-def encrypt_parallel(path, data_pwd, meta_pwd, threads, aid, seal):
+def encrypt_parallel(path, data_pwd, meta_pwd, threads, aid, seal, parity=0):
+    """
+    `threads` is a worker count or "auto" (see sched.pick_workers).
+    `parity` > 0 writes that many XOR parity files (see vylt.parity).
+    """
     path = os.path.abspath(path.rstrip("/"))
-    check_disk_space(path)
+    size = check_disk_space(path)
 
     files = _collect_files(path)
     if not files:
         raise SystemExit("❌ Nothing to encrypt")
 
-    parent = os.path.dirname(path)
-    base = os.path.basename(path)
-
-    n = threads if threads > 1 else 1
-    buckets = [files[i::n] for i in range(n)]
-
-    tasks = []
+    auto = threads == "auto"
+    n, workers, why = _shape(size, len(files), threads)
+    if auto:
+        print(f"⚙️ Auto: {workers} worker(s), {n} shard(s) — {', '.join(why)}")
 
-    for i, b in enumerate(buckets, 1):
-        if not b:
-            continue
-
-        if n == 1:
-            out = os.path.join(parent, f"{base}.{aid.hex()}.vylt")
-        else:
-            out = os.path.join(
-                parent,
-                f"{base}.{aid.hex()}.{i:03d}.vylt"
-            )
+    # Names are relative to the root's parent, wherever vylt runs from.
+    start = os.path.dirname(path)
+    tasks = [
+        (b, out, data_pwd, meta_pwd, aid, i, total, seal, start)
+        for b, out, i, total in plan_shards(path, files, n, aid)
+    ]
+    n = len(tasks)
 
-        tasks.append((b, out, data_pwd, meta_pwd, aid, i, len(buckets), seal))
+    if n > 1:
+        throttle.share(workers)
 
     if n == 1:
         worker(tasks[0])
+    elif auto:
+        with ProcessPoolExecutor(workers) as ex, Governor(workers) as gov:
+            with tqdm(
+                total=len(tasks),
+                desc="🛡️ Encrypting",
+                unit="shard",
+                colour="magenta",
+            ) as bar:
+                run_gated(ex, worker, tasks, gov, lambda _: bar.update(1))
+        for e in gov.events:
+            print(f"⚙️ Concurrency {e}")
     else:
         with ProcessPoolExecutor(n) as ex:
             list(
@@ -185,3 +327,75 @@ def encrypt_parallel(path, data_pwd, meta_pwd, threads, aid, seal):
                     colour="magenta",
                 )
             )
+
+    throttle.share(1)
+
+    if parity:
+        from .parity import write_parity
+
+        t0 = time.perf_counter()
+        pars = write_parity([t[1] for t in tasks], n, aid, parity)
+        print(
+            f"🧩 Parity : {len(pars)} file(s) in "
+            f"{time.perf_counter() - t0:.2f} s"
+        )
+
+
+def plan_encrypt(path, threads, parity=0, profile=None):
+    """
+    Dry run of encrypt_parallel: scan `path`, build the same shard plan
+    and size every shard, the output, peak scratch use (temp tar and
+    ciphertext of the largest shards running at once) and the duration
+    from the `vylt setup` profile. Nothing is written.
+    """
+    path = os.path.abspath(path.rstrip("/"))
+    files = _collect_files(path)
+    if not files:
+        raise SystemExit("❌ Nothing to encrypt")
+
+    sizes = _sizes(files)
+    size = sum(sizes.values())
+
+    n, workers, why = _shape(size, len(files), threads)
+
+    shards = []
+    for b, _, part, _ in plan_shards(path, files, n, bytes(8), sizes=sizes):
+        tar = tar_size(sizes[f] for f in b)
+        # Manifest paths + file index; ciph overhead is not counted.
+        meta = 24 + sum(len(f.encode()) + 17 for f in b)
+        shards.append({
+            "part": part,
+            "files": len(b),
+            "bytes": sum(sizes[f] for f in b),
+            "tar": tar,
+            "container": HEADER_SIZE + EXT_SIZE + meta
+                         + 32 * block_count(tar) + tar,
+        })
+    workers = min(workers, len(shards))
+
+    tars = sorted((s["tar"] for s in shards), reverse=True)
+    parity_bytes = 0
+    if parity:
+        groups = max(1, min(parity, len(shards)))
+        parity_bytes = sum(
+            max(s["container"] for s in shards[g::groups])
+            for g in range(groups)
+        )
+
+    out_dir = os.path.dirname(path)
+    return {
+        "path": path,
+        "files": len(files),
+        "bytes": size,
+        "workers": workers,
+        "reasons": why,
+        "shards": shards,
+        "output": sum(s["container"] for s in shards) + parity_bytes,
+        "parity": parity_bytes,
+        "out_dir": out_dir,
+        "out_free": shutil.disk_usage(out_dir).free,
+        "scratch": 2 * sum(tars[:workers]),
+        "scratch_dir": tempfile.gettempdir(),
+        "scratch_free": scratch_free(),
+        "seconds": estimate_seconds(tars, workers, profile),
+    }
@@ -0,0 +1,205 @@
+import os
+import glob
+import hashlib
+from contextlib import ExitStack
+
+from .header import pack_parity, read_parity
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+CHUNK = 8 * 1024 * 1024
+
+
+# -------------------------
+# Naming
+# -------------------------
+#
+# Parts are <base>.<aid>[.NNN].vylt; parity files <base>.<aid>.NNN.vpar,
+# which find_parts() never picks up.
+
+def _stem(path):
+    """`<dir>/<base>.<aid>` for any part or parity file of an archive."""
+    d, name = os.path.split(path)
+    stem = os.path.splitext(name)[0]
+    root, _, tag = stem.rpartition(".")
+    if root and tag.isdigit() and len(tag) != 16:
+        stem = root
+    return os.path.join(d, stem)
+
+
+def part_path(stem, part, total):
+    return f"{stem}.{part:03d}.vylt" if total > 1 else f"{stem}.vylt"
+
+
+def parity_path(stem, group):
+    return f"{stem}.{group:03d}.vpar"
+
+
+def find_parity(path):
+    return sorted(glob.glob(glob.escape(_stem(path)) + ".*.vpar"))
+
+
+# -------------------------
+# XOR
+# -------------------------
+
+def _xor(chunks):
+    # Python ints XOR whole buffers in C; little-endian zero-pads short
+    # chunks at the end, which is what a shorter member contributes.
+    acc = 0
+    n = 0
+    for c in chunks:
+        acc ^= int.from_bytes(c, "little")
+        n = max(n, len(c))
+    return acc.to_bytes(n, "little")
+
+
+def _sha256(path):
+    h = hashlib.sha256()
+    with open(path, "rb") as f:
+        for b in iter(lambda: f.read(CHUNK), b""):
+            h.update(b)
+    return h.digest()
+
+
+# -------------------------
+# Encode
+# -------------------------
+
+def write_parity(paths, total, aid, groups):
+    """
+    Write `groups` XOR parity files for the parts in `paths` (part
+    order, part N at index N-1). Part N belongs to group
+    (N-1) % groups + 1, so any one lost part per group can be rebuilt.
+
+    Returns the parity file paths.
+    """
+    groups = max(1, min(groups, len(paths)))
+    stem = _stem(paths[0])
+    out = []
+
+    for g in range(1, groups + 1):
+        parts = list(range(g, len(paths) + 1, groups))
+        target = parity_path(stem, g)
+        tmp = target + ".tmp"
+
+        with ExitStack() as st:
+            srcs = [st.enter_context(open(paths[p - 1], "rb")) for p in parts]
+            hashes = [hashlib.sha256() for _ in parts]
+            sizes = [0] * len(parts)
+            dst = st.enter_context(open(tmp, "wb"))
+
+            # Placeholder header; lengths and hashes are known at the end.
+            blank = [(p, 0, bytes(32)) for p in parts]
+            dst.write(pack_parity(aid, total, g, groups, blank))
+
+            while True:
+                chunks = [f.read(CHUNK) for f in srcs]
+                if not any(chunks):
+                    break
+                for i, c in enumerate(chunks):
+                    hashes[i].update(c)
+                    sizes[i] += len(c)
+                dst.write(_xor(chunks))
+
+            members = [
+                (p, n, h.digest()) for p, n, h in zip(parts, sizes, hashes)
+            ]
+            dst.seek(0)
+            dst.write(pack_parity(aid, total, g, groups, members))
+
+        os.replace(tmp, target)
+        out.append(target)
+
+    return out
+
+
+# -------------------------
+# Repair
+# -------------------------
+
+def repair(path):
+    """
+    Rebuild missing or damaged parts of the archive that `path` (any of
+    its parts or parity files) belongs to. No password is needed: whole
+    part files are checked against the hashes in the parity headers and
+    rebuilt by XOR-ing the survivors with the group parity in one
+    streaming pass.
+
+    Returns (repaired, intact) lists of part paths. Raises ValueError
+    if there is no parity or a group lost more than one part.
+    """
+    stem = _stem(path)
+    pars = find_parity(path)
+    if not pars:
+        raise ValueError("No parity files found")
+
+    repaired = []
+    intact = []
+
+    for par in pars:
+        with open(par, "rb") as f:
+            _, total, group, _, members, hsize = read_parity(f)
+
+        paths = [part_path(stem, p, total) for p, _, _ in members]
+        bad = [i for i, p in enumerate(paths) if not os.path.exists(p)]
+        if not bad:
+            # Nothing missing: find a damaged part by its hash.
+            bad = [
+                i for i, p in enumerate(paths)
+                if os.path.getsize(p) != members[i][1]
+                or _sha256(p) != members[i][2]
+            ]
+
+        if not bad:
+            intact.extend(paths)
+            continue
+        if len(bad) > 1:
+            names = ", ".join(os.path.basename(paths[i]) for i in bad)
+            raise ValueError(f"Parity group {group} lost {len(bad)} parts: {names}")
+
+        lost = bad[0]
+        keep = [i for i in range(len(paths)) if i != lost]
+        target = paths[lost]
+        tmp = target + ".tmp"
+        left = members[lost][1]
+
+        with ExitStack() as st:
+            pf = st.enter_context(open(par, "rb"))
+            pf.seek(hsize)
+            srcs = [st.enter_context(open(paths[i], "rb")) for i in keep]
+            hashes = [hashlib.sha256() for _ in keep]
+            out = hashlib.sha256()
+            dst = st.enter_context(open(tmp, "wb"))
+
+            while True:
+                chunks = [f.read(CHUNK) for f in srcs]
+                p = pf.read(CHUNK)
+                if not p and not any(chunks):
+                    break
+                for h, c in zip(hashes, chunks):
+                    h.update(c)
+                data = _xor([p, *chunks])[:left]
+                out.update(data)
+                dst.write(data)
+                left -= len(data)
+
+        for i, h in zip(keep, hashes):
+            if h.digest() != members[i][2]:
+                os.unlink(tmp)
+                raise ValueError(
+                    f"Parity group {group}: {os.path.basename(paths[i])} "
+                    f"is damaged too"
+                )
+        if left or out.digest() != members[lost][2]:
+            os.unlink(tmp)
+            raise ValueError(f"Parity group {group}: parity file is damaged")
+
+        os.replace(tmp, target)
+        repaired.append(target)
+        intact.extend(paths[i] for i in keep)
+
+    return repaired, intact
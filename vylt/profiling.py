@@ -0,0 +1,124 @@
+"""
+Opt-in profiling for `--profile REPORT`.
+
+Enabled by VYLT_PROFILE_DIR, which process pool workers inherit. Each
+stage() records its wall time and, where the interpreter allows
+another profiler to start, a cProfile of the calling thread, into that
+directory. report() merges every process and thread into one text file.
+
+When the variable is unset, stage() costs one environment lookup.
+"""
+
+import os
+import time
+import threading
+from contextlib import contextmanager, nullcontext
+
+ENV = "VYLT_PROFILE_DIR"
+TOP = 25
+
+_OFF = nullcontext()
+_seq = iter(range(1 << 62))
+
+
+def start():
+    """Create a collection directory and enable profiling (inherited)."""
+    import tempfile
+
+    d = tempfile.mkdtemp(prefix="vylt-prof-")
+    os.environ[ENV] = d
+    return d
+
+
+def stop():
+    os.environ.pop(ENV, None)
+
+
+def stage(name):
+    d = os.environ.get(ENV)
+    return _OFF if d is None else _profiled(d, name)
+
+
+@contextmanager
+def _profiled(d, name):
+    import cProfile
+
+    prof = cProfile.Profile()
+    try:
+        prof.enable()
+    except ValueError:
+        # Another profiler is active (Python 3.12+ allows one at a
+        # time): keep the stage timing only.
+        prof = None
+
+    t0 = time.perf_counter()
+    try:
+        yield
+    finally:
+        dt = time.perf_counter() - t0
+        tag = f"{name}.{os.getpid()}.{threading.get_ident()}.{next(_seq)}"
+        if prof is not None:
+            prof.disable()
+            prof.dump_stats(os.path.join(d, tag + ".prof"))
+        with open(os.path.join(d, tag + ".time"), "w") as f:
+            f.write(f"{dt}\n")
+
+
+# -------------------------
+# Report
+# -------------------------
+
+def report(d, out, title="vylt"):
+    """
+    Merge everything collected in `d` into the text report `out` and
+    remove `d`. Returns `out`.
+    """
+    import shutil
+    import pstats
+
+    times = {}
+    procs = {}
+    profs = {}
+    for name in sorted(os.listdir(d)):
+        base, ext = os.path.splitext(name)
+        stage_name, pid = base.split(".")[:2]
+        path = os.path.join(d, name)
+        if ext == ".time":
+            with open(path) as f:
+                t = float(f.read())
+            n, total = times.get(stage_name, (0, 0.0))
+            times[stage_name] = (n + 1, total + t)
+            per = procs.setdefault(pid, {})
+            per[stage_name] = per.get(stage_name, 0.0) + t
+        elif ext == ".prof":
+            profs.setdefault(stage_name, []).append(path)
+
+    with open(out, "w") as f:
+        f.write(f"Vylt profile — {title}\n")
+        f.write(f"{len(procs)} process(es)\n\n")
+
+        f.write("Stages (wall seconds, summed over workers and threads)\n")
+        for stage_name, (n, t) in sorted(times.items(), key=lambda s: -s[1][1]):
+            f.write(f"  {stage_name:<12} {t:10.3f} s  {n:6d} call(s)\n")
+
+        f.write("\nPer process\n")
+        for pid, per in sorted(procs.items()):
+            cols = "  ".join(f"{k} {v:.3f}s" for k, v in sorted(per.items()))
+            f.write(f"  pid {pid:<8} {cols}\n")
+
+        everything = None
+        for stage_name, paths in sorted(profs.items()):
+            st = pstats.Stats(*paths, stream=f)
+            f.write(f"\n\n===== {stage_name}: top {TOP} by cumulative time =====\n")
+            st.strip_dirs().sort_stats("cumulative").print_stats(TOP)
+            if everything is None:
+                everything = pstats.Stats(*paths, stream=f)
+            else:
+                everything.add(*paths)
+
+        if everything is not None:
+            f.write(f"\n\n===== all stages: top {TOP} by internal time =====\n")
+            everything.strip_dirs().sort_stats("tottime").print_stats(TOP)
+
+    shutil.rmtree(d, ignore_errors=True)
+    return out
@@ -0,0 +1,336 @@
+import os
+import glob
+import stat
+import time
+import tarfile
+import tempfile
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+from . import throttle
+from .header import read_outer
+from .ciphwrap import decrypt_file
+from .fileprogress import track_progress
+from .profiling import stage
+from .selective import safe_target
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+# Bodies at or below SMALL_FILE are read on the tar thread and handed to
+# the writer pool; larger ones are copied inline through a fixed buffer.
+WRITERS = 8
+SMALL_FILE = 1024 * 1024
+INFLIGHT = 64
+CHUNK = 1024 * 1024
+
+_ROOT = hasattr(os, "geteuid") and os.geteuid() == 0
+
+# New files never follow a symlink planted at their path.
+_CREATE = os.O_WRONLY | os.O_CREAT | os.O_TRUNC | getattr(os, "O_NOFOLLOW", 0)
+
+
+# -------------------------
+# Writers
+# -------------------------
+
+def _finish(fd, m):
+    if _ROOT:
+        try:
+            os.fchown(fd, m.uid, m.gid)
+        except OSError:
+            pass
+    os.fchmod(fd, m.mode & 0o7777)
+    os.utime(fd, (m.mtime, m.mtime))
+    throttle.drop(fd, written=True)
+
+
+def _write_small(target, data, m):
+    wr = throttle.limits()[1]
+    if wr:
+        wr.take(len(data))
+    fd = os.open(target, _CREATE, 0o600)
+    try:
+        view = memoryview(data)
+        while view:
+            view = view[os.write(fd, view):]
+        _finish(fd, m)
+    finally:
+        os.close(fd)
+
+
+def _write_large(target, src, m):
+    with open(os.open(target, _CREATE, 0o600), "wb") as dst:
+        throttle.copy(src, dst, wr=throttle.limits()[1], chunk=CHUNK)
+        dst.flush()
+        _finish(dst.fileno(), m)
+
+
+def _clear(target):
+    """Remove whatever is at `target`; False if it is a directory."""
+    if not os.path.lexists(target):
+        return True
+    if os.path.isdir(target) and not os.path.islink(target):
+        return False
+    os.unlink(target)
+    return True
+
+
+def _link(out, target, m):
+    if not _clear(target):
+        return False
+
+    if m.issym():
+        dest = os.path.join(os.path.dirname(target), m.linkname)
+        real = os.path.realpath(dest)
+        if real != out and not real.startswith(out + os.sep):
+            return False
+        os.symlink(m.linkname, target)
+        return True
+
+    source = safe_target(out, m.linkname, replace=False)
+    if source is None or not os.path.isfile(source):
+        return False
+    os.link(source, target)
+    return True
+
+
+def _node(target, m):
+    """FIFOs always; character and block devices only as root."""
+    if not m.isfifo() and not _ROOT:
+        return False
+    if not _clear(target):
+        return False
+
+    if m.isfifo():
+        os.mkfifo(target, 0o600)
+    else:
+        kind = stat.S_IFCHR if m.ischr() else stat.S_IFBLK
+        os.mknod(target, kind | 0o600, os.makedev(m.devmajor, m.devminor))
+    if _ROOT:
+        try:
+            os.chown(target, m.uid, m.gid)
+        except OSError:
+            pass
+    os.chmod(target, m.mode & 0o7777)
+    os.utime(target, (m.mtime, m.mtime))
+    return True
+
+
+# -------------------------
+# Extraction
+# -------------------------
+
+def extract_parallel(tar_path, out, writers=WRITERS):
+    """
+    Restore a tar archive into `out`.
+
+    Headers are read first so every directory can be created in one
+    sorted pass. Bodies are then read sequentially; small ones are
+    written by a bounded pool of threads, large ones inline. Links are
+    created after all regular files, and directory modes/mtimes are
+    applied last, deepest first. FIFOs are recreated, and device nodes
+    when running as root. Members that would escape `out`, that cannot
+    be recreated, or whose path is taken by a directory are skipped.
+
+    Returns (restored, skipped) member counts.
+    """
+    out = os.path.realpath(out)
+    os.makedirs(out, exist_ok=True)
+
+    with tarfile.open(tar_path, "r") as tar:
+        seen = set()
+        dirs = []
+        files = []
+        links = []
+        nodes = []
+        skipped = 0
+
+        # A name may occur more than once; the last copy wins, as with
+        # tar. Re-inserting keeps the survivors in archive order.
+        latest = {}
+        for m in tar.getmembers():
+            target = safe_target(out, m.name, seen)
+            if target is None:
+                skipped += 1
+            else:
+                latest.pop(target, None)
+                latest[target] = m
+
+        for target, m in latest.items():
+            if m.isdir():
+                dirs.append((target, m))
+            elif m.isreg():
+                files.append((target, m))
+            elif m.issym() or m.islnk():
+                links.append((target, m))
+            elif m.isdev():
+                nodes.append((target, m))
+            else:
+                skipped += 1
+
+        need = {t for t, _ in dirs}
+        for group in (files, links, nodes):
+            need.update(os.path.dirname(t) for t, _ in group)
+        for d in sorted(need):
+            os.makedirs(d, exist_ok=True)
+
+        slots = threading.BoundedSemaphore(INFLIGHT)
+        errors = []
+
+        def done(fut):
+            slots.release()
+            exc = fut.exception()
+            if exc is not None:
+                errors.append(exc)
+
+        with ThreadPoolExecutor(max(1, writers)) as ex:
+            for target, m in files:
+                if errors:
+                    break
+                src = tar.extractfile(m)
+                if m.size > SMALL_FILE:
+                    _write_large(target, src, m)
+                    continue
+                data = src.read()
+                slots.acquire()
+                ex.submit(_write_small, target, data, m).add_done_callback(done)
+
+        if errors:
+            raise errors[0]
+
+    count = len(files)
+    for target, m in links:
+        if _link(out, target, m):
+            count += 1
+        else:
+            skipped += 1
+    for target, m in nodes:
+        if _node(target, m):
+            count += 1
+        else:
+            skipped += 1
+
+    for target, m in sorted(dirs, key=lambda d: d[0], reverse=True):
+        os.chmod(target, m.mode & 0o7777)
+        os.utime(target, (m.mtime, m.mtime))
+
+    return count + len(dirs), skipped
+
+
+# -------------------------
+# Parts
+# -------------------------
+
+def find_parts(path):
+    base = os.path.basename(path)
+    parts = base.rsplit(".", 3)
+    if len(parts) < 3:
+        return [path]
+    root, aid = parts[0], parts[1]
+    if not all(c in "0123456789abcdef" for c in aid):
+        return [path]
+    prefix = os.path.join(os.path.dirname(path), f"{root}.{aid}.")
+    pattern = glob.escape(prefix) + "*.vylt"
+    return sorted(glob.glob(pattern)) or [path]
+
+
+def _skip(f, n):
+    try:
+        f.seek(n, os.SEEK_CUR)
+        return
+    except (AttributeError, OSError):
+        pass
+    while n:
+        b = f.read(min(n, CHUNK))
+        if not b:
+            raise ValueError("Truncated Vylt archive")
+        n -= len(b)
+
+
+def restore_part(src, password, outdir, writers=WRITERS, progress=None):
+    """
+    Decrypt one container part and restore its files into `outdir`.
+
+    `src` is a path or a readable binary file object positioned at the
+    start of the container. `progress`, if given, is called with the
+    payload size and must return a context manager yielding a tqdm-like
+    bar.
+
+    Returns a dict of per-part statistics.
+    """
+    outdir = os.path.abspath(outdir)
+    os.makedirs(outdir, exist_ok=True)
+
+    own = isinstance(src, (str, os.PathLike))
+    if own:
+        tar_name = os.path.splitext(os.path.basename(src))[0] + ".tar"
+        tar_path = os.path.join(outdir, tar_name)
+    else:
+        fd, tar_path = tempfile.mkstemp(dir=outdir, suffix=".tar")
+        os.close(fd)
+
+    fd, payload = tempfile.mkstemp()
+    os.close(fd)
+    rd, wr = throttle.limits()
+
+    try:
+        with stage("read"):
+            f = open(src, "rb") if own else src
+            try:
+                lay = read_outer(f)
+                aid, part, total = lay.aid, lay.part, lay.total
+                _skip(f, lay.data_off - lay.header_size)
+                with open(payload, "wb") as o:
+                    throttle.copy(f, o, rd, wr, CHUNK)
+            finally:
+                if own:
+                    throttle.drop(f.fileno())
+                    f.close()
+
+        size = os.path.getsize(payload)
+
+        t0 = time.perf_counter()
+        with stage("decrypt"):
+            if progress is None:
+                decrypt_file(payload, tar_path, password, rd, wr)
+            else:
+                with progress(size) as bar:
+                    stop = threading.Event()
+                    t = threading.Thread(
+                        target=track_progress,
+                        args=(tar_path, bar, stop),
+                        daemon=True,
+                    )
+                    t.start()
+                    try:
+                        decrypt_file(payload, tar_path, password, rd, wr)
+                    finally:
+                        stop.set()
+                        t.join()
+                    bar.update(bar.total - bar.n)
+        t1 = time.perf_counter()
+
+        os.unlink(payload)
+        with stage("extract"):
+            count, skipped = extract_parallel(tar_path, outdir, writers)
+        t2 = time.perf_counter()
+
+        return {
+            "aid": aid,
+            "part": part,
+            "total": total,
+            "entries": count,
+            "skipped": skipped,
+            "size": size,
+            "decrypt_seconds": t1 - t0,
+            "extract_seconds": t2 - t1,
+        }
+    finally:
+        for p in (payload, tar_path):
+            try:
+                os.unlink(p)
+            except FileNotFoundError:
+                pass
@@ -0,0 +1,270 @@
+import os
+import math
+import shutil
+import tempfile
+import threading
+from concurrent.futures import FIRST_COMPLETED, wait
+
+from .config import load_profile
+
+
+# -------------------------
+# Tuning
+# -------------------------
+
+# Rough resident cost of one encrypt worker: interpreter, packer
+# readahead window, copy buffers.
+WORKER_MEM = 160 * 1024 * 1024
+# Trees below this are not worth a process pool.
+MIN_PARALLEL = 64 * 1024 * 1024
+# Each input byte is written ~3 times on scratch/output disks
+# (tar, ciphertext, container).
+WRITE_AMPLIFICATION = 3
+# Auto mode cuts the tree into this many shards per worker so the
+# governor has queued work it can hold back.
+SHARDS_PER_WORKER = 2
+
+# Governor thresholds.
+MEM_FLOOR = 256 * 1024 * 1024
+IO_PRESSURE = 40.0      # PSI "some avg10", percent
+MEM_PRESSURE = 10.0
+INTERVAL = 1.0
+
+
+# -------------------------
+# Probes
+# -------------------------
+
+def mem_available():
+    """Bytes of memory available without swapping, or None."""
+    try:
+        with open("/proc/meminfo") as f:
+            for line in f:
+                if line.startswith("MemAvailable:"):
+                    return int(line.split()[1]) * 1024
+    except (OSError, ValueError, IndexError):
+        pass
+    try:
+        return os.sysconf("SC_AVPHYS_PAGES") * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+def pressure(kind):
+    """Linux PSI "some avg10" for "io" / "memory", or None."""
+    try:
+        with open(f"/proc/pressure/{kind}") as f:
+            some = f.readline().split()
+    except OSError:
+        return None
+    for field in some[1:]:
+        if field.startswith("avg10="):
+            try:
+                return float(field[6:])
+            except ValueError:
+                return None
+    return None
+
+
+def scratch_free(path=None):
+    try:
+        return shutil.disk_usage(path or tempfile.gettempdir()).free
+    except OSError:
+        return None
+
+
+# -------------------------
+# Planning
+# -------------------------
+
+def worker_mbps(profile):
+    """
+    End-to-end MB/s of one encrypt worker (pack, ciph, hash, write):
+    measured by `vylt setup`, or for older profiles the ciph stage and
+    WRITE_AMPLIFICATION disk writes run back to back. None without a
+    profile.
+    """
+    if profile.get("worker_mbps"):
+        return profile["worker_mbps"]
+    enc = profile.get("encrypt_mbps")
+    disk = profile.get("disk_write_mbps")
+    if not enc or not disk:
+        return None
+    return 1 / (1 / enc + WRITE_AMPLIFICATION / disk)
+
+
+def pick_workers(total_bytes, units, profile=None, scratch=None,
+                 shard_bytes=None):
+    """
+    Choose a worker count for `units` independent jobs covering
+    `total_bytes`, from CPU count, available memory, scratch space and
+    the `vylt setup` profile (ciph vs. disk throughput).
+
+    `shard_bytes(workers)` gives the size of the pieces the work will be
+    cut into for a worker count (default: `units` equal pieces); the
+    scratch limit is taken from it.
+
+    Returns (workers, reasons) where reasons lists the binding limits.
+    """
+    profile = load_profile() if profile is None else profile
+    cpu = os.cpu_count() or 1
+    n = cpu
+    reasons = [f"{cpu} cpu"]
+
+    def limit(value, why):
+        nonlocal n
+        value = max(1, int(value))
+        if value < n:
+            n = value
+            reasons.append(why)
+
+    limit(units, f"{units} shard(s)")
+
+    if total_bytes < MIN_PARALLEL:
+        limit(1, "small input")
+
+    avail = mem_available()
+    if avail is not None:
+        limit(avail // 2 // WORKER_MEM, f"{avail >> 20} MB free memory")
+
+    rate = worker_mbps(profile)
+    disk = profile.get("disk_write_mbps")
+    if rate and disk:
+        # One worker keeps the disk busy for WRITE_AMPLIFICATION × rate
+        # of every second; add workers until it is saturated. Two can
+        # always overlap one's ciph stage with the other's writes.
+        limit(
+            max(2, math.ceil(disk / (rate * WRITE_AMPLIFICATION))),
+            f"disk {disk:.0f} MB/s vs {rate:.0f} MB/s per worker",
+        )
+
+    free = scratch_free(scratch)
+    if free is not None and units and total_bytes:
+        if shard_bytes is None:
+            def shard_bytes(w):
+                return total_bytes / units
+        # Temp tar + ciphertext per running shard.
+        w = n
+        while w > 1 and w * 2 * shard_bytes(w) > free:
+            w -= 1
+        limit(w, f"{free >> 20} MB scratch")
+
+    return n, reasons
+
+
+def shard_count(workers, units):
+    return max(1, min(units, workers * SHARDS_PER_WORKER))
+
+
+def estimate_seconds(shard_bytes, workers, profile=None):
+    """
+    Rough wall time to encrypt shards of `shard_bytes` on `workers`
+    processes. Shards are dealt largest first to the least-loaded
+    worker at the measured ciph speed. The result is never below the
+    time the disk needs to write every byte WRITE_AMPLIFICATION times.
+    Returns None without a `vylt setup` profile.
+    """
+    profile = load_profile() if profile is None else profile
+    enc = profile.get("encrypt_mbps")
+    disk = profile.get("disk_write_mbps")
+    if not enc:
+        return None
+
+    mb = 1024 * 1024
+    load = [0.0] * max(1, workers)
+    for b in sorted(shard_bytes, reverse=True):
+        i = load.index(min(load))
+        load[i] += b / (enc * mb)
+
+    t = max(load)
+    if disk:
+        t = max(t, sum(shard_bytes) * WRITE_AMPLIFICATION / (disk * mb))
+    return t
+
+
+# -------------------------
+# Governor
+# -------------------------
+
+class Governor:
+    """
+    Background sampler that lowers the allowed concurrency when memory
+    runs low or the kernel reports I/O / memory pressure, and lets it
+    recover one step at a time (never above the starting limit) once
+    things stay calm.
+    """
+
+    def __init__(self, limit, interval=INTERVAL):
+        self.max = max(1, limit)
+        self.limit = self.max
+        self.interval = interval
+        self.events = []
+        self._calm = 0
+        self._stop = threading.Event()
+        self._t = None
+
+    def _strained(self):
+        avail = mem_available()
+        if avail is not None and avail < MEM_FLOOR:
+            return f"{avail >> 20} MB free memory"
+        io = pressure("io")
+        if io is not None and io > IO_PRESSURE:
+            return f"io pressure {io:.0f}%"
+        mem = pressure("memory")
+        if mem is not None and mem > MEM_PRESSURE:
+            return f"memory pressure {mem:.0f}%"
+        return None
+
+    def sample(self):
+        why = self._strained()
+        if why:
+            self._calm = 0
+            if self.limit > 1:
+                self.limit -= 1
+                self.events.append(f"↓ {self.limit} ({why})")
+        else:
+            self._calm += 1
+            if self._calm >= 5 and self.limit < self.max:
+                self._calm = 0
+                self.limit += 1
+                self.events.append(f"↑ {self.limit}")
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self.sample()
+
+    def __enter__(self):
+        self._t = threading.Thread(target=self._run, daemon=True)
+        self._t.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._stop.set()
+        self._t.join()
+
+
+def run_gated(ex, fn, tasks, gov, on_done=None):
+    """
+    Submit `tasks` to executor `ex`, keeping at most `gov.limit`
+    running. Re-checks the limit whenever a task finishes or every
+    governor interval. Returns results in completion order.
+    """
+    todo = list(tasks)
+    todo.reverse()
+    running = set()
+    results = []
+
+    while todo or running:
+        while todo and len(running) < gov.limit:
+            running.add(ex.submit(fn, todo.pop()))
+
+        done, running = wait(
+            running, timeout=gov.interval, return_when=FIRST_COMPLETED
+        )
+        for fut in done:
+            r = fut.result()
+            results.append(r)
+            if on_done:
+                on_done(r)
+
+    return results
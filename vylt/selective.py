@@ -1,9 +1,40 @@
+import os
 import fnmatch
 import tarfile
 from pathlib import Path
-from tqdm import tqdm
+
+
+def safe_target(out, name, seen=None, replace=True):
+    """
+    Absolute extraction path for member `name` under the real directory
+    `out`, or None if it would land outside it (absolute names, `..`,
+    symlinked parents). A symlink already at the target itself is
+    removed so the member replaces it instead of being written through
+    it, or with replace=False makes the name unsafe. `seen` caches
+    parent directories already checked.
+    """
+    target = os.path.normpath(os.path.join(out, name))
+    if not target.startswith(out + os.sep):
+        return None
+
+    parent = os.path.dirname(target)
+    if seen is None or parent not in seen:
+        real = os.path.realpath(parent)
+        if real != out and not real.startswith(out + os.sep):
+            return None
+        if seen is not None:
+            seen.add(parent)
+
+    if os.path.islink(target):
+        if not replace:
+            return None
+        os.unlink(target)
+    return target
+
 
 def extract(stream, patterns, out):
+    from tqdm import tqdm
+
     out = Path(out).resolve()
     out.mkdir(parents=True, exist_ok=True)
 
@@ -17,9 +48,9 @@ def extract(stream, patterns, out):
             if not any(fnmatch.fnmatch(name, p) for p in patterns):
                 continue
 
-            target = (out / name).resolve()
-            if not str(target).startswith(str(out)):
+            target = safe_target(str(out), name)
+            if target is None:
                 continue
 
-            target.parent.mkdir(parents=True, exist_ok=True)
+            os.makedirs(os.path.dirname(target), exist_ok=True)
             tar.extract(m, path=out)
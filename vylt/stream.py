@@ -0,0 +1,171 @@
+import os
+import hashlib
+import threading
+
+from .header import (
+    STREAM_MAGIC,
+    STREAM_SIZE,
+    TRAILER_SIZE,
+    pack_stream,
+    pack_trailer,
+    unpack_stream,
+    unpack_trailer,
+)
+from . import throttle
+from .ciphwrap import encrypt_fd, decrypt_fd
+
+
+CHUNK = 1024 * 1024
+
+
+# -------------------------
+# Helpers
+# -------------------------
+
+def _write_all(fd, data):
+    view = memoryview(data)
+    while view:
+        view = view[os.write(fd, view):]
+
+
+def _read_exact(fd, n):
+    buf = b""
+    while len(buf) < n:
+        b = os.read(fd, n - len(buf))
+        if not b:
+            raise ValueError("Truncated Vylt stream")
+        buf += b
+    return buf
+
+
+def _spawn(fn, *args):
+    """Run fn(*args) on a thread; returns (thread, errors)."""
+    errors = []
+
+    def run():
+        try:
+            fn(*args)
+        except BaseException as e:
+            errors.append(e)
+
+    t = threading.Thread(target=run, daemon=True)
+    t.start()
+    return t, errors
+
+
+# -------------------------
+# Stream container
+# -------------------------
+
+def encrypt_stream(infd, outfd, password, aid=None):
+    """
+    Encrypt everything readable from `infd` into a stream container on
+    `outfd`, in constant memory. ciph writes into a pipe; this thread
+    hashes and counts the ciphertext on its way out, and appends the
+    length/hash trailer at EOF.
+
+    Returns (aid, length, data_hash).
+    """
+    aid = os.urandom(8) if aid is None else aid
+    _write_all(outfd, pack_stream(aid))
+
+    r, w = os.pipe()
+
+    def run():
+        try:
+            encrypt_fd(infd, w, password)
+        finally:
+            os.close(w)
+
+    t, errors = _spawn(run)
+
+    rd, wr = throttle.limits()
+    h = hashlib.sha256()
+    n = 0
+    try:
+        while True:
+            b = os.read(r, CHUNK)
+            if not b:
+                break
+            # ciph reads the input in C; charge it with the output.
+            if rd:
+                rd.take(len(b))
+            if wr:
+                wr.take(len(b))
+            h.update(b)
+            n += len(b)
+            _write_all(outfd, b)
+    finally:
+        os.close(r)
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    digest = h.digest()
+    _write_all(outfd, pack_trailer(n, digest))
+    return aid, n, digest
+
+
+def decrypt_stream(infd, outfd, password):
+    """
+    Decrypt a stream container from `infd` to `outfd`, in constant
+    memory. The last TRAILER_SIZE bytes are held back from ciph and
+    checked against the ciphertext that went through.
+
+    Plaintext is written before the trailer can be checked, so callers
+    must treat an exception as "discard the output".
+
+    Returns the archive ID.
+    """
+    magic, _, aid = unpack_stream(_read_exact(infd, STREAM_SIZE))
+    if magic != STREAM_MAGIC:
+        raise ValueError("Not a Vylt stream")
+
+    r, w = os.pipe()
+
+    def run():
+        try:
+            decrypt_fd(r, outfd, password)
+        finally:
+            os.close(r)
+
+    t, errors = _spawn(run)
+
+    rd, wr = throttle.limits()
+    h = hashlib.sha256()
+    n = 0
+    tail = b""
+    try:
+        while True:
+            b = os.read(infd, CHUNK)
+            if not b:
+                break
+            # ciph writes the output in C; charge it with the input.
+            if rd:
+                rd.take(len(b))
+            if wr:
+                wr.take(len(b))
+            buf = tail + b
+            cut = len(buf) - TRAILER_SIZE
+            if cut <= 0:
+                tail = buf
+                continue
+            body, tail = buf[:cut], buf[cut:]
+            h.update(body)
+            n += len(body)
+            _write_all(w, body)
+    except BrokenPipeError:
+        # ciph stopped reading; its own error is reported below.
+        pass
+    finally:
+        os.close(w)
+        t.join()
+
+    if errors:
+        raise errors[0]
+
+    length, digest = unpack_trailer(tail)
+    if length != n or digest != h.digest():
+        raise ValueError("Stream integrity check failed")
+    return aid
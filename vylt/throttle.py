@@ -0,0 +1,238 @@
+"""
+I/O throttling and priority for background runs.
+
+Limits are set once per run (configure / share) through environment
+variables, so process pool workers inherit them. Each process builds
+its own token buckets from them; threads in one process share them.
+With nothing configured, limits() returns (None, None) and drop() is a
+single flag check.
+"""
+
+import os
+import time
+import shutil
+import platform
+import threading
+from contextlib import contextmanager
+
+READ_ENV = "VYLT_MAX_READ_MBPS"
+WRITE_ENV = "VYLT_MAX_WRITE_MBPS"
+SHARE_ENV = "VYLT_IO_SHARE"
+DROP_ENV = "VYLT_DROP_CACHE"
+
+MB = 1024 * 1024
+
+_cache = None
+
+
+# -------------------------
+# Token bucket
+# -------------------------
+
+class Bucket:
+    """
+    Token bucket of `rate` bytes/s holding up to a quarter second of
+    burst. take() may run into debt; the caller then sleeps until the
+    debt is repaid, so chunks larger than the burst still average out
+    to `rate`.
+    """
+
+    def __init__(self, rate):
+        self.rate = rate
+        self.burst = max(rate / 4, 64 * 1024)
+        self.tokens = self.burst
+        self.t = time.monotonic()
+        self.lock = threading.Lock()
+
+    def take(self, n):
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.t) * self.rate)
+            self.t = now
+            self.tokens -= n
+            wait = -self.tokens / self.rate if self.tokens < 0 else 0
+        if wait:
+            time.sleep(wait)
+
+
+# -------------------------
+# Configuration
+# -------------------------
+
+def configure(read_mbps=None, write_mbps=None, drop_cache=False):
+    """Set run-wide limits (MB/s) for this process and its workers."""
+    global _cache
+    for key, val in ((READ_ENV, read_mbps), (WRITE_ENV, write_mbps)):
+        if val:
+            os.environ[key] = str(float(val))
+        else:
+            os.environ.pop(key, None)
+    if drop_cache:
+        os.environ[DROP_ENV] = "1"
+    else:
+        os.environ.pop(DROP_ENV, None)
+    _cache = None
+
+
+def share(workers):
+    """
+    Split the limits evenly over `workers` processes started next;
+    share(1) restores the full rate for this process afterwards.
+    """
+    global _cache
+    os.environ[SHARE_ENV] = str(max(1, int(workers)))
+    _cache = None
+
+
+def limits():
+    """(read_bucket, write_bucket) for this process; None when unlimited."""
+    global _cache
+    pid = os.getpid()
+    if _cache is None or _cache[0] != pid:
+        n = int(os.environ.get(SHARE_ENV, "1"))
+        buckets = []
+        for key in (READ_ENV, WRITE_ENV):
+            v = os.environ.get(key)
+            buckets.append(Bucket(float(v) * MB / n) if v else None)
+        _cache = (pid, buckets[0], buckets[1], DROP_ENV in os.environ)
+    return _cache[1], _cache[2]
+
+
+def copy(src, dst, rd=None, wr=None, chunk=MB):
+    """shutil.copyfileobj, charging `rd` / `wr` for every chunk."""
+    if rd is None and wr is None:
+        shutil.copyfileobj(src, dst, chunk)
+        return
+    while True:
+        b = src.read(chunk)
+        if not b:
+            return
+        if rd:
+            rd.take(len(b))
+        if wr:
+            wr.take(len(b))
+        dst.write(b)
+
+
+@contextmanager
+def pipes(src, dst, rd=None, wr=None):
+    """
+    Descriptors for a native call copying file `src` into file `dst`.
+    Without limits they are the files themselves. With limits they are
+    pipe ends, and two threads pump `src` in (charging `rd`) and `dst`
+    out (charging `wr`), so the token buckets pace the call while it
+    runs. The caller closes both descriptors (fclose on fdopen'ed FILEs).
+    """
+    if rd is None and wr is None:
+        infd = os.open(src, os.O_RDONLY)
+        try:
+            outfd = os.open(dst, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        except BaseException:
+            os.close(infd)
+            raise
+        yield infd, outfd
+        return
+
+    in_r, in_w = os.pipe()
+    out_r, out_w = os.pipe()
+    errors = []
+
+    def feed():
+        try:
+            with open(src, "rb") as f, open(in_w, "wb") as p:
+                copy(f, p, rd=rd)
+        except BrokenPipeError:
+            # The native side stopped reading; it reports its own error.
+            pass
+        except BaseException as e:
+            errors.append(e)
+
+    def drain():
+        try:
+            with open(out_r, "rb") as p, open(dst, "wb") as f:
+                copy(p, f, wr=wr)
+        except BaseException as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=fn, daemon=True) for fn in (feed, drain)]
+    for t in threads:
+        t.start()
+    try:
+        yield in_r, out_w
+    finally:
+        for t in threads:
+            t.join()
+    if errors:
+        raise errors[0]
+
+
+def drop(fd, written=False):
+    """
+    Drop `fd`'s pages from the page cache if --drop-cache is on.
+    Dirty pages are not dropped, so a file just `written` is flushed
+    to disk first.
+    """
+    if _cache is None or _cache[0] != os.getpid():
+        limits()
+    if _cache[3]:
+        if written:
+            getattr(os, "fdatasync", os.fsync)(fd)
+        try:
+            os.posix_fadvise(fd, 0, 0, os.POSIX_FADV_DONTNEED)
+        except (AttributeError, OSError):
+            pass
+
+
+# -------------------------
+# Priority
+# -------------------------
+
+# ioprio_set syscall numbers by machine.
+_IOPRIO_SET = {
+    "x86_64": 251,
+    "amd64": 251,
+    "i386": 289,
+    "i686": 289,
+    "aarch64": 30,
+    "arm64": 30,
+    "riscv64": 30,
+    "armv7l": 314,
+    "ppc64le": 273,
+    "ppc64": 273,
+    "s390x": 282,
+}
+_IOPRIO_CLASS = {"rt": 1, "be": 2, "idle": 3}
+_IOPRIO_WHO_PROCESS = 1
+
+
+def set_ioprio(spec):
+    """
+    Apply an I/O scheduling class to this process (inherited by
+    workers): "idle", or "be"/"rt" with an optional ":0-7" level.
+    Raises ValueError for a bad spec and OSError where unsupported.
+    """
+    cls, _, level = spec.partition(":")
+    if cls not in _IOPRIO_CLASS:
+        raise ValueError(f"Unknown I/O class: {cls}")
+    level = int(level or 4)
+    if not 0 <= level <= 7:
+        raise ValueError("I/O priority level must be 0-7")
+
+    nr = _IOPRIO_SET.get(platform.machine().lower())
+    if nr is None or not platform.system() == "Linux":
+        raise OSError("ioprio_set is not available on this platform")
+
+    import ctypes
+
+    libc = ctypes.CDLL(None, use_errno=True)
+    prio = (_IOPRIO_CLASS[cls] << 13) | (0 if cls == "idle" else level)
+    if libc.syscall(nr, _IOPRIO_WHO_PROCESS, 0, prio) != 0:
+        err = ctypes.get_errno()
+        raise OSError(err, os.strerror(err))
+
+
+def set_nice(n):
+    """Lower this process's CPU priority by `n` (inherited by workers)."""
+    if n < 0:
+        raise ValueError("--nice only lowers priority: N must be >= 0")
+    os.nice(n)
@@ -19,7 +19,7 @@ run_step() {
 }
 
 cleanup() {
-  rm -rf testdata restored *.vylt orig.sha dec.sha sel.sha
+  rm -rf testdata restored *.vylt *.vpar *.vyls orig.sha dec.sha sel.sha
 }
 
 cleanup
@@ -42,6 +42,141 @@ run_step "[3/10] Info + list" bash -c "
   vylt list testdata.*.vylt >/dev/null
 "
 
+run_step "      Verify blocks" bash -c "
+  vylt verify testdata.*.vylt >/dev/null &&
+  cp testdata.*.vylt damaged.vylt &&
+  printf 'X' | dd of=damaged.vylt bs=1 seek=20000000 conv=notrunc status=none &&
+  ! vylt verify damaged.vylt >/dev/null &&
+  vylt verify damaged.vylt | grep -q 'big' ;
+  rc=\$?; rm -f damaged.vylt; exit \$rc
+"
+
+run_step "      Parity repair" bash -c "
+  mkdir -p par && cp testdata/readme.txt testdata/level1/level2/info.txt par/ &&
+  vylt encrypt par --threads 2 --parity 1 >/dev/null &&
+  cp par.*.002.vylt par.orig && rm par.*.002.vylt &&
+  vylt repair par.*.001.vylt >/dev/null &&
+  cmp par.orig par.*.002.vylt ;
+  rc=\$?; rm -rf par par.*; exit \$rc
+"
+
+run_step "      Batch two roots" bash -c "
+  mkdir -p b1 b2/sub bout &&
+  cp testdata/readme.txt b1/ && cp testdata/level1/level2/info.txt b2/sub/ &&
+  head -c 3000000 testdata/big1.bin > b2/blob &&
+  echo '[{\"path\": \"b1\"}, {\"path\": \"b2\", \"out\": \"bout\", \"parity\": 1, \"shards\": 2}]' > jobs.json &&
+  vylt batch jobs.json >/dev/null &&
+  ls bout/b2.*.vpar >/dev/null &&
+  vylt decrypt b1.*.vylt --out brest >/dev/null &&
+  vylt decrypt bout/b2.*.001.vylt --out brest >/dev/null &&
+  diff -r b1 brest/b1 && diff -r b2 brest/b2 ;
+  rc=\$?; rm -rf b1 b2 bout brest b1.* jobs.json; exit \$rc
+"
+
+run_step "      API + aio round trip" python3 -c "
+import asyncio, filecmp, io, os, shutil, sys
+from vylt import api, aio
+
+def same(a, b):
+    c = filecmp.dircmp(a, b)
+    return not (c.left_only or c.right_only or c.diff_files) and all(
+        same(os.path.join(a, d), os.path.join(b, d)) for d in c.common_dirs)
+
+os.makedirs('apiout')
+try:
+    res = api.encrypt_tree('testdata/level1', 'apiout', b'pw', threads='auto')
+    part = res.parts[0].path
+    names = list(api.iter_manifest(part))
+    api.decrypt_archive(part, b'pw', 'apiout/r1')
+
+    # Single part through file objects, then the asyncio wrappers.
+    with open('apiout/obj.vylt', 'wb') as f:
+        api.encrypt_tree('testdata/level1/level2', f, b'pw', seal=True)
+    with open('apiout/obj.vylt', 'rb') as f:
+        api.decrypt_archive(f, b'pw', 'apiout/r2')
+    sealed = asyncio.run(aio.iter_manifest('apiout/obj.vylt', b'pw'))
+    asyncio.run(aio.decrypt_archive('apiout/obj.vylt', b'pw', 'apiout/r3'))
+
+    ok = (any(n.endswith('big2.bin') for n in names) and list(sealed)
+          and same('testdata/level1', 'apiout/r1/level1')
+          and same('testdata/level1/level2', 'apiout/r2/level2')
+          and same('testdata/level1/level2', 'apiout/r3/level2'))
+finally:
+    shutil.rmtree('apiout')
+sys.exit(0 if ok else 1)
+"
+
+run_step "      Throttled + drop-cache" bash -c "
+  cp -r testdata/level1 thr &&
+  vylt encrypt thr --threads 2 --max-write-mbps 200 --drop-cache --nice 5 >/dev/null &&
+  vylt decrypt thr.*.001.vylt --out threst --max-write-mbps 200 --drop-cache >/dev/null &&
+  diff -r thr threst/thr ;
+  rc=\$?; rm -rf thr thr.* threst; exit \$rc
+"
+
+# --plan must not ask for a password or write anything.
+run_step "      Encrypt plan" bash -c "
+  before=\$(ls *.vylt *.vpar 2>/dev/null)
+  OUT=\$(env -u VYLT_PASSWORD vylt encrypt testdata --plan --threads 2 </dev/null 2>&1) &&
+  echo \"\$OUT\" | grep -q 'Shards *: 2' &&
+  echo \"\$OUT\" | grep -q '#002' &&
+  ! echo \"\$OUT\" | grep -qi 'password' &&
+  [ \"\$(ls *.vylt *.vpar 2>/dev/null)\" = \"\$before\" ]
+"
+
+run_step "      Profile report" bash -c "
+  cp -r testdata/level1 prof &&
+  vylt encrypt prof --threads 2 --profile enc.prof >/dev/null 2>&1 &&
+  vylt decrypt prof.*.001.vylt --out profrest --profile dec.prof >/dev/null 2>&1 &&
+  grep -Eq '^  pack ' enc.prof && grep -Eq '^  encrypt ' enc.prof &&
+  [ \$(grep -oE '^[0-9]+ process' enc.prof | grep -oE '[0-9]+') -gt 1 ] &&
+  grep -Eq '^  decrypt ' dec.prof && grep -Eq '^  extract ' dec.prof ;
+  rc=\$?; rm -rf prof prof.* profrest enc.prof dec.prof; exit \$rc
+"
+
+run_step "      Stream round trip" bash -c "
+  vylt encrypt - < testdata/big1.bin > stream.vyls 2>/dev/null &&
+  vylt decrypt - < stream.vyls 2>/dev/null | cmp - testdata/big1.bin
+"
+
+run_step "      Truncated stream fails" bash -c "
+  ! head -c -100 stream.vyls | vylt decrypt - >/dev/null 2>&1 &&
+  ! vylt decrypt stream.vyls --out restored >/dev/null 2>&1 &&
+  [ ! -e restored ] ;
+  rc=\$?; rm -f stream.vyls; exit \$rc
+"
+
+# A `vylt setup` profile must refine --threads auto, never serialise it.
+run_step "      Auto workers with profile" python3 -c "
+import os, sys
+from vylt import sched
+os.cpu_count = lambda: 16
+sched.mem_available = lambda: 1 << 40
+sched.scratch_free = lambda path=None: 1 << 50
+G = 1 << 30
+bare = sched.pick_workers(50 * G, 100000, {})[0]
+fast = sched.pick_workers(50 * G, 100000, {'encrypt_mbps': 1500, 'disk_write_mbps': 3000})[0]
+real = sched.pick_workers(50 * G, 100000, {'encrypt_mbps': 400, 'disk_write_mbps': 3000,
+                                           'worker_mbps': 150})[0]
+slow = sched.pick_workers(50 * G, 100000, {'encrypt_mbps': 400, 'disk_write_mbps': 100})[0]
+print(bare, fast, real, slow)
+sys.exit(0 if bare == 16 and fast >= 2 and real >= 6 and slow >= 2 else 1)
+"
+
+# info/list are scripted over thousands of archives: importing the CLI
+# must not pull in tqdm, tarfile, process pools or libciph.
+run_step "      CLI import budget" python3 -c "
+import sys, time
+t = time.perf_counter()
+import vylt.cli
+dt = time.perf_counter() - t
+heavy = [m for m in ('tqdm', 'tarfile', 'tempfile', 'glob', 'ctypes',
+                     'concurrent.futures', 'vylt.parallel', 'vylt.ciphwrap')
+         if m in sys.modules]
+print(f'{dt * 1000:.1f} ms', heavy or '')
+sys.exit(1 if heavy or dt > 0.15 else 0)
+"
+
 # -------------------------------------------------
 echo "[4/10] Rename + decrypt"
 mv testdata.*.vylt renamed.vylt
@@ -88,6 +223,15 @@ run_step "[7/10] Sealed list does not leak names" bash -c '
   echo "$OUT" | grep -q "secret.txt" && exit 1 || exit 0
 '
 
+run_step "      Sealed verify, wrong password" bash -c '
+  cp testdata.*.vylt dmg.vylt &&
+  printf X | dd of=dmg.vylt bs=1 seek=$(($(stat -c%s dmg.vylt) - 5)) conv=notrunc status=none
+  OUT=$(VYLT_PASSWORD=wrong vylt verify dmg.vylt 2>&1); rc=$?
+  rm -f dmg.vylt
+  [ $rc -eq 1 ] && echo "$OUT" | grep -q "affected files unknown" &&
+    ! echo "$OUT" | grep -q Traceback
+'
+
 # -------------------------------------------------
 echo "[8/10] Decrypt sealed archive"
 export VYLT_PASSWORD="sealed_pass"